@@ -1,18 +1,102 @@
-from fastapi import Depends, HTTPException, Header
+import hashlib
+import time
+from typing import Optional
+from fastapi import HTTPException, Header, Request
+import httpx
 from jose import jwt, JWTError
+from cache import TTLCache
 from config import settings
+from supabase_client import get_http_client
 
+AUDIENCE = "authenticated"
+ASYMMETRIC_ALGORITHMS = {"RS256", "ES256", "EdDSA"}
+JWKS_TTL_SECONDS = 600
+JWKS_MIN_REFRESH_SECONDS = 30
 
-async def get_current_user(authorization: str = Header(...)):
-    """Verify Supabase JWT from Authorization: Bearer <token> header."""
-    try:
-        token = authorization.replace("Bearer ", "")
-        payload = jwt.decode(
-            token,
-            settings.supabase_jwt_secret,
-            algorithms=["HS256"],
-            audience="authenticated",
-        )
+
+class TokenVerifier:
+    """Verifies Supabase access tokens, remembering ones it has already checked.
+
+    HS256 tokens are checked against the project's JWT secret. Tokens signed
+    with asymmetric keys are checked against the project's JWKS, fetched
+    once and refreshed when it expires or an unknown `kid` shows up.
+    Verified claims are cached until the token's own `exp`.
+    """
+
+    def __init__(self, secret: str, jwks_url: Optional[str], max_tokens: int = 1024):
+        self.secret = secret
+        self.jwks_url = jwks_url
+        self._verified = TTLCache(max_entries=max_tokens, max_bytes=4 * 1024 * 1024, ttl=0)
+        self._jwks: dict[str, dict] = {}
+        self._jwks_fetched_at: Optional[float] = None
+
+    async def verify(self, token: str) -> dict:
+        key = hashlib.sha256(token.encode()).digest()
+        payload = self._verified.get(key)
+        if payload is not None:
+            return payload
+
+        try:
+            header = jwt.get_unverified_header(token)
+            alg = header.get("alg")
+            if alg in ASYMMETRIC_ALGORITHMS and self.jwks_url:
+                signing_key = await self._get_jwk(header.get("kid"))
+            elif alg == "HS256":
+                signing_key = self.secret
+            else:
+                raise JWTError(f"Unsupported algorithm {alg}")
+            payload = jwt.decode(token, signing_key, algorithms=[alg], audience=AUDIENCE)
+        except JWTError:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+        remaining = payload.get("exp", 0) - time.time()
+        if remaining > 0:
+            self._verified.set(key, payload, ttl=remaining)
         return payload
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+    async def _get_jwk(self, kid: Optional[str]) -> dict:
+        stale = (
+            self._jwks_fetched_at is None
+            or time.monotonic() - self._jwks_fetched_at >= JWKS_TTL_SECONDS
+        )
+        if kid not in self._jwks or stale:
+            await self._refresh_jwks()
+        if kid not in self._jwks:
+            raise JWTError("Unknown signing key")
+        return self._jwks[kid]
+
+    async def _refresh_jwks(self):
+        # Don't let a stream of bad `kid`s hammer the JWKS endpoint
+        if (
+            self._jwks_fetched_at is not None
+            and time.monotonic() - self._jwks_fetched_at < JWKS_MIN_REFRESH_SECONDS
+        ):
+            return
+        try:
+            resp = await get_http_client().get(self.jwks_url)
+        except httpx.HTTPError:
+            raise JWTError("Could not fetch signing keys")
+        if resp.status_code != 200:
+            raise JWTError("Could not fetch signing keys")
+        self._jwks = {k["kid"]: k for k in resp.json().get("keys", []) if "kid" in k}
+        self._jwks_fetched_at = time.monotonic()
+
+
+verifier = TokenVerifier(
+    settings.supabase_jwt_secret,
+    settings.supabase_jwks_url or f"{settings.supabase_url}/auth/v1/.well-known/jwks.json",
+)
+
+
+async def get_current_user(request: Request, authorization: Optional[str] = Header(None)):
+    """Verify Supabase JWT from Authorization: Bearer <token> header."""
+    # Memoised per request so chained dependencies verify the token once
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return user
+    if not authorization:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    token = authorization.removeprefix("Bearer ").strip()
+    request.state.user = await verifier.verify(token)
+    return request.state.user
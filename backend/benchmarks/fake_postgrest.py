@@ -0,0 +1,574 @@
+import asyncio
+import json
+import random
+import re
+import uuid
+from functools import lru_cache
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+import httpx
+
+# An in-memory stand-in for Supabase's PostgREST API, good enough to run the
+# backend against without a database. Tables, column defaults, unique
+# columns and foreign keys (which drive embedding) are read from
+# supabase_schema.sql. It covers the query features the routers use:
+# select with (aliased, !inner) embeds, eq/neq/gt/gte/lt/lte/in/is/like/
+# ilike filters, not., or=(...), order, limit/offset, count=exact and
+# single-object responses. The Postgres functions the benchmarks hit are
+# reimplemented in FUNCTIONS.
+
+SCHEMA_PATH = Path(__file__).resolve().parents[2] / "supabase_schema.sql"
+OBJECT_MEDIA_TYPE = "application/vnd.pgrst.object+json"
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "or", "and", "on_conflict", "columns"}
+
+_TABLE = re.compile(r"CREATE TABLE public\.(\w+) \((.*?)\n\);", re.DOTALL)
+_INSERT = re.compile(r"INSERT INTO (\w+) \(([^)]*)\) VALUES \(([^)]*)\);")
+_REFERENCES = re.compile(r"REFERENCES (?:(\w+)\.)?(\w+)\((\w+)\)(?: ON DELETE (CASCADE|SET NULL))?")
+_DEFAULT = re.compile(r"DEFAULT ('(?:[^']|'')*'|[\w.]+\(\)|[\w.-]+)")
+_TIMESTAMP = re.compile(r"^\d{4}-\d{2}-\d{2}(T[\d:.]+)?(Z|[+-]\d{2}:\d{2})?$")
+
+
+class PostgrestError(Exception):
+    """Raised inside the fake; sent back the way PostgREST reports errors."""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+@dataclass
+class Column:
+    name: str
+    type: str
+    default: str | None = None
+    unique: bool = False
+    references: tuple[str, str] | None = None  # (table, column)
+    on_delete: str | None = None
+
+
+@dataclass
+class Table:
+    name: str
+    columns: dict[str, Column] = field(default_factory=dict)
+    rows: list[dict] = field(default_factory=list)
+
+
+def _split(text: str, sep: str = ",") -> list[str]:
+    """Split on `sep` outside parentheses and double quotes."""
+    parts, depth, quoted, current = [], 0, False, ""
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == sep and depth == 0 and not quoted:
+            parts.append(current)
+            current = ""
+        else:
+            current += ch
+    if current:
+        parts.append(current)
+    return [p.strip() for p in parts]
+
+
+def parse_schema(sql: str) -> dict[str, Table]:
+    tables = {}
+    for name, body in _TABLE.findall(sql):
+        table = Table(name)
+        for line in _split(re.sub(r"--[^\n]*", "", body)):
+            words = line.split()
+            if not words or words[0] in ("PRIMARY", "UNIQUE", "CHECK", "CONSTRAINT", "FOREIGN"):
+                continue
+            if "GENERATED ALWAYS" in line:
+                continue  # computed by Postgres; never stored or returned here
+            column = Column(words[0], words[1].upper(), unique="UNIQUE" in line)
+            default = _DEFAULT.search(line)
+            if default:
+                column.default = default.group(1)
+            ref = _REFERENCES.search(line)
+            if ref and not ref.group(1):  # auth.users lives outside the schema
+                column.references = (ref.group(2), ref.group(3))
+                column.on_delete = ref.group(4)
+            table.columns[column.name] = column
+        tables[name] = table
+    return tables
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _default(column: Column):
+    raw = column.default
+    if raw is None or raw.upper() == "NULL":
+        return None
+    if raw == "gen_random_uuid()":
+        return str(uuid.uuid4())
+    if raw == "now()":
+        return _now()
+    if raw.startswith("'"):
+        text = raw[1:-1].replace("''", "'")
+        return json.loads(text) if column.type == "JSONB" else text
+    if raw.lower() in ("true", "false"):
+        return raw.lower() == "true"
+    return float(raw) if "." in raw else int(raw)
+
+
+@lru_cache(maxsize=65536)
+def _parse_text(value: str):
+    if _TIMESTAMP.match(value):
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _sort_key(value):
+    """Comparable form of a stored or filter value; timestamps compare as times."""
+    return _parse_text(value) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=4096)
+def _options(raw: str, kind: type) -> frozenset:
+    """The parsed values of an `in.(a,b,...)` list, for columns of type `kind`."""
+    return frozenset(_sort_key(_coerce(o, kind())) for o in _split(raw.strip()[1:-1]))
+
+
+def _coerce(raw: str, sample):
+    raw = raw.strip('"')
+    if raw == "null":
+        return None
+    if isinstance(sample, bool):
+        return raw == "true"
+    if isinstance(sample, int):
+        return int(raw)
+    if isinstance(sample, float):
+        return float(raw)
+    return raw
+
+
+def _like(pattern: str, value, flags=0) -> bool:
+    regex = "".join(".*" if ch in "*%" else "." if ch == "_" else re.escape(ch) for ch in pattern)
+    return value is not None and re.fullmatch(regex, str(value), flags) is not None
+
+
+def _test(value, op: str, raw: str) -> bool:
+    """Evaluate one PostgREST operator (`eq`, `in`, ...) against a value."""
+    negate = op.startswith("not.")
+    if negate:
+        op, _, raw = f"{op[4:]}.{raw}".partition(".")
+    if op == "is":
+        result = value is {"null": None, "true": True, "false": False}[raw]
+    elif op == "in":
+        result = value is not None and _sort_key(value) in _options(raw, type(value))
+    elif op in ("like", "ilike"):
+        result = _like(raw, value, re.IGNORECASE if op == "ilike" else 0)
+    else:
+        target = _coerce(raw, value)
+        if value is None or target is None:
+            result = False
+        else:
+            a, b = _sort_key(value), _sort_key(target)
+            result = {
+                "eq": a == b, "neq": a != b, "gt": a > b,
+                "gte": a >= b, "lt": a < b, "lte": a <= b,
+            }[op]
+    return not result if negate else result
+
+
+def _logic(row: dict, expr: str, conjunction: str) -> bool:
+    """Evaluate an or=(...)/and(...) expression against a row."""
+    results = []
+    for term in _split(expr[1:-1]):
+        nested = re.match(r"^(not\.)?(and|or)(\(.*\))$", term)
+        if nested:
+            outcome = _logic(row, nested.group(3), nested.group(2))
+            results.append(not outcome if nested.group(1) else outcome)
+        else:
+            column, _, rest = term.partition(".")
+            op, _, raw = rest.partition(".")
+            if op == "not":
+                inner_op, _, raw = raw.partition(".")
+                op = f"not.{inner_op}"
+            results.append(_test(row.get(column), op, raw))
+    return any(results) if conjunction == "or" else all(results)
+
+
+@dataclass
+class Embed:
+    alias: str
+    relation: str
+    inner: bool
+    fields: list
+
+
+def parse_select(text: str) -> list:
+    """Columns (str, or "*") and Embeds of a `select` parameter."""
+    fields = []
+    for item in _split(text or "*"):
+        match = re.match(r"^(?:(\w+):)?(\w+)(!inner)?\((.*)\)$", item, re.DOTALL)
+        if match:
+            alias, relation, inner, inner_select = match.groups()
+            fields.append(Embed(alias or relation, relation, bool(inner), parse_select(inner_select)))
+        else:
+            fields.append(item.split(":")[-1].split("::")[0])
+    return fields
+
+
+class FakePostgrest(httpx.AsyncBaseTransport):
+    """httpx transport answering /rest/v1 requests from in-memory tables.
+
+    `latency` (seconds, plus up to `jitter` more) is slept before every
+    response to stand in for the network round trip and query time.
+    """
+
+    def __init__(self, tables: dict[str, Table], latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.tables = tables
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._indexes: dict[tuple[str, str], dict] = {}  # dropped on every write
+
+    @classmethod
+    def from_schema(cls, path: Path = SCHEMA_PATH, **kwargs) -> "FakePostgrest":
+        sql = path.read_text()
+        fake = cls(parse_schema(sql), **kwargs)
+        for table, columns, values in _INSERT.findall(sql):
+            row = dict(zip(_split(columns), (v.strip("'") for v in _split(values))))
+            fake.insert(table, row)
+        return fake
+
+    # --- Table operations, also used directly for seeding ---
+
+    def _table(self, name: str) -> Table:
+        if name not in self.tables:
+            raise PostgrestError(404, "42P01", f'relation "public.{name}" does not exist')
+        return self.tables[name]
+
+    def _check(self, table: Table, row: dict, ignore: dict | None = None):
+        for column in table.columns.values():
+            value = row.get(column.name)
+            if value is None:
+                continue
+            if column.unique and any(
+                other is not ignore and other.get(column.name) == value for other in table.rows
+            ):
+                raise PostgrestError(
+                    409, "23505", f'duplicate key value violates unique constraint "{table.name}_{column.name}_key"'
+                )
+            if column.references and column.references[0] in self.tables:
+                target, key = column.references
+                if not any(r.get(key) == value for r in self.tables[target].rows):
+                    raise PostgrestError(
+                        409, "23503", f'insert or update on table "{table.name}" violates foreign key constraint'
+                    )
+
+    def insert(self, name: str, values: dict) -> dict:
+        table = self._table(name)
+        unknown = set(values) - set(table.columns)
+        if unknown:
+            raise PostgrestError(400, "PGRST204", f"Could not find the '{unknown.pop()}' column of '{name}'")
+        row = {col.name: _default(col) for col in table.columns.values()}
+        row.update(values)
+        self._check(table, row)
+        table.rows.append(row)
+        self._indexes.clear()
+        return row
+
+    def update(self, name: str, rows: list[dict], values: dict) -> list[dict]:
+        table = self._table(name)
+        for row in rows:
+            changed = {**row, **values}
+            if "updated_at" in table.columns:  # the update_updated_at trigger
+                changed["updated_at"] = _now()
+            self._check(table, changed, ignore=row)
+            row.update(changed)
+        self._indexes.clear()
+        return rows
+
+    def delete(self, name: str, rows: list[dict]) -> list[dict]:
+        table = self._table(name)
+        doomed = {id(row) for row in rows}
+        table.rows = [row for row in table.rows if id(row) not in doomed]
+        self._indexes.clear()
+        for other in self.tables.values():
+            for column in other.columns.values():
+                if column.references and column.references[0] == name:
+                    key = column.references[1]
+                    gone = {row[key] for row in rows}
+                    children = [r for r in other.rows if r.get(column.name) in gone]
+                    if column.on_delete == "CASCADE":
+                        self.delete(other.name, children)
+                    elif column.on_delete == "SET NULL":
+                        for child in children:
+                            child[column.name] = None
+        return rows
+
+    # --- Reads ---
+
+    def _lookup(self, table: str, column: str, value) -> list[dict]:
+        """Rows of `table` whose `column` equals `value`, via a lazy hash index."""
+        index = self._indexes.get((table, column))
+        if index is None:
+            index = {}
+            for row in self.tables[table].rows:
+                index.setdefault(row.get(column), []).append(row)
+            self._indexes[(table, column)] = index
+        return index.get(value, []) if value is not None else []
+
+    def _relationship(self, table: str, relation: str) -> tuple[str, str, bool]:
+        """(local column, remote column, to-many) joining `table` to `relation`."""
+        for column in self.tables[table].columns.values():
+            if column.references and column.references[0] == relation:
+                return column.name, column.references[1], False
+        for column in self._table(relation).columns.values():
+            if column.references and column.references[0] == table:
+                return column.references[1], column.name, True
+        raise PostgrestError(
+            400, "PGRST200", f"Could not find a relationship between '{table}' and '{relation}'"
+        )
+
+    def _project(self, table: str, row: dict, fields: list, filters: dict, path: tuple) -> dict | None:
+        """Shape a row per `fields`; None if an !inner embed comes back empty."""
+        out = {}
+        for item in fields:
+            if item == "*":
+                out.update(row)
+            elif isinstance(item, str):
+                out[item] = row.get(item)
+            else:
+                sub_path = path + (item.alias,)
+                local, remote, to_many = self._relationship(table, item.relation)
+                matched = []
+                for candidate in self._lookup(item.relation, remote, row.get(local)):
+                    if not all(_test(candidate.get(col), op, raw) for col, op, raw in filters.get(sub_path, [])):
+                        continue
+                    shaped = self._project(item.relation, candidate, item.fields, filters, sub_path)
+                    if shaped is not None:
+                        matched.append(shaped)
+                if to_many:
+                    out[item.alias] = matched
+                else:
+                    out[item.alias] = matched[0] if matched else None
+                if item.inner and not matched:
+                    return None
+        return out
+
+    def _filters(self, params: httpx.QueryParams) -> dict[tuple, list]:
+        """Filters keyed by embed path; () holds the top-level ones."""
+        filters: dict[tuple, list] = {}
+        for key, value in params.multi_items():
+            if key in RESERVED_PARAMS or key.endswith((".limit", ".offset", ".order")):
+                continue
+            *path, column = key.split(".")
+            op, _, raw = value.partition(".")
+            if op == "not":
+                inner_op, _, raw = raw.partition(".")
+                op = f"not.{inner_op}"
+            filters.setdefault(tuple(path), []).append((column, op, raw))
+        return filters
+
+    def _matching(self, name: str, params: httpx.QueryParams) -> list[dict]:
+        filters = self._filters(params).get((), [])
+        rows = [
+            row for row in self._table(name).rows
+            if all(_test(row.get(col), op, raw) for col, op, raw in filters)
+        ]
+        if "or" in params:
+            rows = [row for row in rows if _logic(row, params["or"], "or")]
+        return rows
+
+    def select(self, name: str, params: httpx.QueryParams) -> tuple[list[dict], int]:
+        """Rows for a GET, and the total before limit/offset."""
+        filters = self._filters(params)
+        fields = parse_select(params.get("select", "*"))
+        rows = self._matching(name, params)
+        for term in reversed(params.get("order", "").split(",") if params.get("order") else []):
+            column, *modifiers = term.split(".")
+            desc = "desc" in modifiers
+            nulls_first = "nullsfirst" in modifiers or (desc and "nullslast" not in modifiers)
+            present = [r for r in rows if r.get(column) is not None]
+            missing = [r for r in rows if r.get(column) is None]
+            present.sort(key=lambda r: _sort_key(r[column]), reverse=desc)
+            rows = missing + present if nulls_first else present + missing
+
+        offset = int(params.get("offset", 0))
+        limit = params.get("limit")
+        end = offset + int(limit) if limit is not None else None
+        if not any(isinstance(item, Embed) and item.inner for item in fields):
+            # No inner joins, so no row can drop out: shape only the page
+            page = [self._project(name, row, fields, filters, ()) for row in rows[offset:end]]
+            return page, len(rows)
+        shaped = [self._project(name, row, fields, filters, ()) for row in rows]
+        shaped = [row for row in shaped if row is not None]
+        return shaped[offset:end], len(shaped)
+
+    # --- HTTP ---
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self._rng.uniform(0, self.jitter))
+        await request.aread()
+        try:
+            return self.handle(request)
+        except PostgrestError as exc:
+            body = {"code": exc.code, "message": exc.message, "details": None, "hint": None}
+            return httpx.Response(exc.status, json=body, request=request)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if not path.startswith("/rest/v1/"):
+            raise PostgrestError(404, "PGRST000", f"{path} is not served by the fake")
+        name = path.removeprefix("/rest/v1/")
+        params = request.url.params
+        body = json.loads(request.content) if request.content else None
+
+        if name.startswith("rpc/"):
+            function = FUNCTIONS.get(name.removeprefix("rpc/"))
+            if function is None:
+                raise PostgrestError(404, "PGRST202", f"Could not find the function public.{name[4:]}")
+            return self._respond(request, function(self, **(body or {})))
+
+        total = None
+        if request.method == "GET":
+            rows, total = self.select(name, params)
+        elif request.method == "POST":
+            inserted = [self.insert(name, values) for values in (body if isinstance(body, list) else [body])]
+            rows = self._represent(name, inserted, params)
+        elif request.method == "PATCH":
+            rows = self._represent(name, self.update(name, self._matching(name, params), body), params)
+        elif request.method == "DELETE":
+            rows = self._represent(name, self.delete(name, self._matching(name, params)), params)
+        else:
+            raise PostgrestError(405, "PGRST000", f"{request.method} is not supported")
+
+        if request.headers.get("accept") == OBJECT_MEDIA_TYPE:
+            if len(rows) != 1:
+                raise PostgrestError(406, "PGRST116", "JSON object requested, multiple (or no) rows returned")
+            return self._respond(request, rows[0])
+        headers = {}
+        if total is not None:
+            counted = "count=exact" in request.headers.get("prefer", "")
+            offset = int(params.get("offset", 0))
+            span = f"{offset}-{offset + len(rows) - 1}" if rows else "*"
+            headers["content-range"] = f"{span}/{total if counted else '*'}"
+        return self._respond(request, rows, headers)
+
+    def _represent(self, name: str, rows: list[dict], params: httpx.QueryParams) -> list[dict]:
+        fields = parse_select(params.get("select", "*"))
+        return [self._project(name, row, fields, {}, ()) or {} for row in rows]
+
+    def _respond(self, request: httpx.Request, data, headers: dict | None = None) -> httpx.Response:
+        return httpx.Response(200, json=data, headers=headers, request=request)
+
+
+# --- Postgres functions (see supabase_schema.sql) ---
+
+SAVE_POST_COLUMNS = (
+    "title", "slug", "excerpt", "content", "content_html", "cover_image_url",
+    "cover_image_srcset", "status", "published_at", "meta_title", "meta_description",
+    "word_count", "reading_time_minutes", "toc", "content_text",
+)
+
+
+def _save_blog_post(db: FakePostgrest, target_post_id: str | None, changes: dict | None = None, tag_ids=None):
+    # No transactions here, so check what Postgres would roll back on first
+    known_tags = {tag["id"] for tag in db.tables["blog_tags"].rows}
+    if tag_ids is not None and not set(tag_ids) <= known_tags:
+        raise PostgrestError(409, "23503", 'insert or update on table "blog_post_tags" violates foreign key constraint')
+    changes = changes or {}
+    derived = changes.get("derived_excerpt")
+    if target_post_id is None:
+        values = {k: v for k, v in changes.items() if k in SAVE_POST_COLUMNS + ("author_id",)}
+        values["excerpt_auto"] = not (values.get("excerpt") or "").strip()
+        if values["excerpt_auto"]:
+            values["excerpt"] = derived
+        if values.get("status") == "published" and values.get("published_at") is None:
+            values["published_at"] = _now()
+        post = db.insert("blog_posts", values)
+        target_post_id = post["id"]
+        changes = {}
+    else:
+        posts = [row for row in db.tables["blog_posts"].rows if row["id"] == target_post_id]
+        if not posts:
+            raise PostgrestError(400, "P0002", "post not found")
+        post = posts[0]
+    auto = post["excerpt_auto"]
+    if "excerpt" in changes:
+        sent = changes["excerpt"]
+        auto = not (sent or "").strip() or (auto and sent == post["excerpt"])
+    changes = {k: v for k, v in changes.items() if k in SAVE_POST_COLUMNS}
+    if changes:
+        changes["excerpt_auto"] = auto
+        if auto and derived is not None:
+            changes["excerpt"] = derived
+    if changes and changes.get("status", post["status"]) == "published":
+        if post["status"] == "published" and post["published_at"] is not None:
+            changes["published_at"] = post["published_at"]
+        elif changes.get("published_at", post["published_at"]) is None:
+            changes["published_at"] = _now()
+    if changes:
+        db.update("blog_posts", [post], changes)
+
+    if tag_ids is not None:
+        links = db.tables["blog_post_tags"]
+        current = {row["tag_id"] for row in links.rows if row["post_id"] == target_post_id}
+        db.delete(
+            "blog_post_tags",
+            [row for row in links.rows if row["post_id"] == target_post_id and row["tag_id"] not in tag_ids],
+        )
+        for tag_id in dict.fromkeys(tag_ids):
+            if tag_id not in current:
+                db.insert("blog_post_tags", {"post_id": target_post_id, "tag_id": tag_id})
+
+    tags_by_id = {tag["id"]: tag for tag in db.tables["blog_tags"].rows}
+    tags = [
+        {key: tags_by_id[row["tag_id"]][key] for key in ("id", "name", "slug")}
+        for row in db.tables["blog_post_tags"].rows
+        if row["post_id"] == target_post_id
+    ]
+    saved = {k: v for k, v in post.items() if k != "content_text"}
+    saved["tags"] = sorted(tags, key=lambda tag: tag["name"])
+    return saved
+
+
+FEATURED_POST_COLUMNS = (
+    "id", "title", "slug", "excerpt", "cover_image_url", "cover_image_srcset", "status",
+    "author_id", "published_at", "created_at", "updated_at", "meta_title", "meta_description",
+    "word_count", "reading_time_minutes",
+)
+
+
+def _get_experience_detail(db: FakePostgrest, target_slug: str):
+    experiences = [
+        row for row in db.tables["work_experiences"].rows
+        if row["slug"] == target_slug and row["is_active"]
+    ]
+    if not experiences:
+        return None
+    experience = dict(experiences[0])
+    timeline = [row for row in db.tables["work_timeline_events"].rows if row["experience_id"] == experience["id"]]
+    experience["timeline"] = sorted(timeline, key=lambda row: row["event_date"], reverse=True)
+    posts = {row["id"]: row for row in db.tables["blog_posts"].rows if row["status"] == "published"}
+    links = sorted(
+        (row for row in db.tables["work_featured_posts"].rows if row["experience_id"] == experience["id"]),
+        key=lambda row: row["sort_order"],
+    )
+    experience["featured_posts"] = [
+        {**{col: posts[link["post_id"]][col] for col in FEATURED_POST_COLUMNS}, "sort_order": link["sort_order"]}
+        for link in links
+        if link["post_id"] in posts
+    ]
+    return experience
+
+
+FUNCTIONS = {
+    "save_blog_post": _save_blog_post,
+    "get_experience_detail": _get_experience_detail,
+}
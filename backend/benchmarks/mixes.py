@@ -0,0 +1,58 @@
+import random
+from dataclasses import dataclass
+from typing import Callable
+from benchmarks.seed import SeedData, make_document
+
+# Traffic mixes: named endpoints with relative weights. Each endpoint builds
+# a request (method, path, JSON body, needs auth) from the seeded data.
+
+
+@dataclass
+class Endpoint:
+    name: str
+    weight: int
+    build: Callable[[random.Random, SeedData], tuple[str, str, dict | None, bool]]
+
+
+def blog_index(rng, data):
+    # Most readers stay on the first page
+    page = 1 if rng.random() < 0.7 else rng.randint(2, 5)
+    return "GET", f"/api/blog/posts?page={page}", None, False
+
+
+def post_detail(rng, data):
+    # Newer posts are read more: pick from the newest quarter most of the time
+    recent = data.post_slugs[-max(1, len(data.post_slugs) // 4):]
+    return "GET", f"/api/blog/posts/{rng.choice(recent if rng.random() < 0.8 else data.post_slugs)}", None, False
+
+
+def tag_filter(rng, data):
+    return "GET", f"/api/blog/posts?tag={rng.choice(data.tag_slugs)}", None, False
+
+
+def experience_detail(rng, data):
+    return "GET", f"/api/work/experiences/{rng.choice(data.experience_slugs)}", None, False
+
+
+def admin_autosave(rng, data):
+    # The editor sends the whole document every few seconds while typing
+    body = {"content": make_document(rng, rng.randint(8, 40))}
+    return "PUT", f"/api/blog/admin/posts/{rng.choice(data.draft_ids)}", body, True
+
+
+READS = [
+    Endpoint("blog_index", 35, blog_index),
+    Endpoint("post_detail", 40, post_detail),
+    Endpoint("tag_filter", 15, tag_filter),
+    Endpoint("experience_detail", 10, experience_detail),
+]
+
+MIXES = {
+    "reader": READS,
+    "mixed": READS + [Endpoint("admin_autosave", 5, admin_autosave)],
+    "editor": [
+        Endpoint("admin_autosave", 60, admin_autosave),
+        Endpoint("blog_index", 20, blog_index),
+        Endpoint("post_detail", 20, post_detail),
+    ],
+}
@@ -0,0 +1,224 @@
+"""Load-test the API against an in-memory Supabase stand-in.
+
+Run from backend/:
+
+    python -m benchmarks.run [--mix mixed] [--requests 2000] [--concurrency 16]
+                             [--latency-ms 5] [--jitter-ms 2] [--no-cache]
+                             [--label NAME] [--compare [FILE]]
+
+The app is driven in-process through httpx's ASGI transport; every Supabase
+call it makes is answered by benchmarks/fake_postgrest.py after the injected
+latency. Reported per endpoint: p50/p99 latency, throughput and Supabase
+calls per request (read from the Server-Timing header). Results are saved
+under benchmarks/results/; --compare prints the change against an earlier
+run (by default the latest one with the same mix).
+
+The fake shares the app's event loop, so absolute numbers include its own
+CPU time. Compare runs made with the same settings rather than reading
+them as production latencies.
+"""
+import os
+
+# Never point a benchmark at a real project, whatever .env says
+os.environ.update(
+    SUPABASE_URL="http://supabase.bench",
+    SUPABASE_SERVICE_ROLE_KEY="bench",
+    SUPABASE_JWT_SECRET="bench-secret",
+    SUPABASE_JWKS_URL="",
+)
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import re
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import httpx
+from jose import jwt
+from cache import public_cache
+from main import app
+from supabase_client import close_supabase, open_supabase
+from benchmarks.fake_postgrest import FakePostgrest
+from benchmarks.mixes import MIXES
+from benchmarks.seed import seed
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+_CALLS = re.compile(r'desc="(\d+) calls"')
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of `values`."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def upstream_calls(response: httpx.Response) -> int:
+    return sum(int(n) for n in _CALLS.findall(response.headers.get("server-timing", "")))
+
+
+def _token(author_id: str) -> str:
+    claims = {"sub": author_id, "aud": "authenticated", "exp": int(time.time()) + 3600}
+    return jwt.encode(claims, os.environ["SUPABASE_JWT_SECRET"], algorithm="HS256")
+
+
+async def run(args) -> dict:
+    db = FakePostgrest.from_schema(
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, seed=args.seed
+    )
+    data = seed(db, posts=args.posts, seed=args.seed)
+    auth = {"Authorization": f"Bearer {_token(data.author_id)}"}
+    endpoints = MIXES[args.mix]
+    weights = [e.weight for e in endpoints]
+    rng = random.Random(args.seed)
+    samples: dict[str, list[tuple[float, int, int]]] = {e.name: [] for e in endpoints}
+
+    await open_supabase(transport=db)
+    public_cache.clear()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def send(endpoint) -> tuple[float, int, int]:
+            method, path, body, needs_auth = endpoint.build(rng, data)
+            if args.no_cache:
+                public_cache.clear()
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body, headers=auth if needs_auth else None)
+            return time.perf_counter() - started, response.status_code, upstream_calls(response)
+
+        for _ in range(args.warmup):
+            await send(rng.choices(endpoints, weights)[0])
+
+        remaining = args.requests
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                endpoint = rng.choices(endpoints, weights)[0]
+                samples[endpoint.name].append(await send(endpoint))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+    await close_supabase()
+
+    endpoint_stats = {}
+    for name, rows in samples.items():
+        if not rows:
+            continue
+        latencies = [seconds * 1000 for seconds, _, _ in rows]
+        endpoint_stats[name] = {
+            "requests": len(rows),
+            "errors": sum(1 for _, status, _ in rows if status >= 400),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "mean_ms": round(sum(latencies) / len(latencies), 3),
+            "throughput_rps": round(len(rows) / elapsed, 1),
+            "upstream_calls": round(sum(calls for _, _, calls in rows) / len(rows), 2),
+        }
+    return {
+        "label": args.label,
+        "mix": args.mix,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "settings": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "posts": args.posts,
+            "cache": not args.no_cache,
+            "seed": args.seed,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 1),
+        "upstream_calls": db.calls,
+        "endpoints": endpoint_stats,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def save(result: dict) -> Path:
+    RESULTS_DIR.mkdir(exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    path = RESULTS_DIR / f"{stamp}-{result['mix']}{'-' + result['label'] if result['label'] else ''}.json"
+    path.write_text(json.dumps(result, indent=2))
+    return path
+
+
+def previous(mix: str, exclude: Path) -> Path | None:
+    """The newest saved result for `mix`, other than `exclude`."""
+    candidates = sorted(
+        p for p in RESULTS_DIR.glob("*.json")
+        if p != exclude and json.loads(p.read_text()).get("mix") == mix
+    )
+    return candidates[-1] if candidates else None
+
+
+def report(result: dict, baseline: dict | None = None):
+    columns = ("requests", "errors", "p50_ms", "p99_ms", "throughput_rps", "upstream_calls")
+    print(
+        f"{result['mix']} mix, {result['settings']['requests']} requests, "
+        f"concurrency {result['settings']['concurrency']}, "
+        f"{result['settings']['latency_ms']} ms upstream latency: "
+        f"{result['throughput_rps']} req/s"
+    )
+    print(f"{'endpoint':<20}" + "".join(f"{c:>16}" for c in columns))
+    for name, stats in result["endpoints"].items():
+        cells = []
+        for column in columns:
+            cell = f"{stats[column]}"
+            before = (baseline or {}).get("endpoints", {}).get(name, {}).get(column)
+            if before and column not in ("requests", "errors"):
+                cell += f" ({(stats[column] - before) / before:+.0%})"
+            cells.append(f"{cell:>16}")
+        print(f"{name:<20}" + "".join(cells))
+    if baseline:
+        print(f"Compared with {baseline.get('commit')} ({baseline['created_at']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the API against a fake Supabase.")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=50, help="unrecorded requests sent first")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="delay per Supabase call")
+    parser.add_argument("--jitter-ms", type=float, default=2.0, help="extra random delay, up to")
+    parser.add_argument("--posts", type=int, default=200, help="published posts to seed")
+    parser.add_argument("--no-cache", action="store_true", help="clear the response cache before every request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--label", default="", help="suffix for the results file name")
+    parser.add_argument("--compare", nargs="?", const="latest", help="result file to compare with")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    path = None if args.no_save else save(result)
+    baseline = None
+    if args.compare:
+        baseline_path = previous(args.mix, path) if args.compare == "latest" else Path(args.compare)
+        if baseline_path is not None:
+            baseline = json.loads(baseline_path.read_text())
+    report(result, baseline)
+    if path:
+        print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    main()
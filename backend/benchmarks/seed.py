@@ -0,0 +1,165 @@
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from tiptap import document_stats, render_html
+from benchmarks.fake_postgrest import FakePostgrest
+
+# Deterministic content for the fake database: posts with realistic TipTap
+# bodies (and the derived columns the editor would have saved), tags,
+# experiences with timelines and featured posts, portfolio items and
+# influences. Rows go through FakePostgrest.insert, so schema defaults apply.
+
+WORDS = (
+    "training strength coach season athlete recovery sprint mobility film camera "
+    "light edit story travel city mountain river interview design build ship team "
+    "practice focus habit morning review plan tempo volume rest nutrition sleep "
+    "project client studio frame colour grade sound music rhythm craft detail"
+).split()
+TAG_NAMES = (
+    "Training", "Film", "Travel", "Nutrition", "Recovery", "Photography", "Coaching",
+    "Design", "Music", "Mindset", "Gear", "Interviews", "Behind the Scenes", "Sprinting",
+    "Strength", "Editing", "Colour", "Sound", "Business", "Notes",
+)
+
+
+@dataclass
+class SeedData:
+    """Keys the traffic mixes pick from."""
+
+    post_slugs: list[str] = field(default_factory=list)
+    draft_ids: list[str] = field(default_factory=list)
+    tag_slugs: list[str] = field(default_factory=list)
+    experience_slugs: list[str] = field(default_factory=list)
+    author_id: str = ""
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def make_document(rng: random.Random, paragraphs: int) -> dict:
+    """A TipTap document with sections, paragraphs, lists and some marks."""
+    content = []
+    for i in range(paragraphs):
+        if i % 5 == 0:
+            content.append({
+                "type": "heading",
+                "attrs": {"level": 2 if i % 10 == 0 else 3},
+                "content": [{"type": "text", "text": _sentence(rng, 4)[:-1]}],
+            })
+        inline = [{"type": "text", "text": _sentence(rng, rng.randint(12, 30)) + " "}]
+        if rng.random() < 0.3:
+            inline.append({"type": "text", "text": rng.choice(WORDS), "marks": [{"type": "bold"}]})
+        if rng.random() < 0.2:
+            inline.append({
+                "type": "text",
+                "text": " see more",
+                "marks": [{"type": "link", "attrs": {"href": "https://example.com/notes"}}],
+            })
+        content.append({"type": "paragraph", "content": inline})
+        if rng.random() < 0.1:
+            content.append({
+                "type": "bulletList",
+                "content": [
+                    {"type": "listItem", "content": [{"type": "paragraph", "content": [
+                        {"type": "text", "text": _sentence(rng, 6)},
+                    ]}]}
+                    for _ in range(3)
+                ],
+            })
+    return {"type": "doc", "content": content}
+
+
+def _document_columns(doc: dict) -> dict:
+    stats = document_stats(doc)
+    stats["content_html"] = render_html(doc)
+    return stats
+
+
+def seed(
+    db: FakePostgrest,
+    posts: int = 200,
+    drafts: int = 20,
+    experiences: int = 8,
+    portfolio_items: int = 60,
+    influences: int = 30,
+    seed: int = 0,
+) -> SeedData:
+    rng = random.Random(seed)
+    data = SeedData(author_id=str(uuid.UUID(int=rng.getrandbits(128))))
+    start = datetime(2022, 1, 1, tzinfo=timezone.utc)
+
+    tags = []
+    for name in TAG_NAMES:
+        slug = name.lower().replace(" ", "-")
+        tags.append(db.insert("blog_tags", {"name": name, "slug": slug}))
+        data.tag_slugs.append(slug)
+
+    published = []
+    for i in range(posts + drafts):
+        is_draft = i >= posts
+        doc = make_document(rng, rng.randint(8, 40))
+        stamp = (start + timedelta(hours=12 * i)).isoformat()
+        post = db.insert("blog_posts", {
+            "title": _sentence(rng, rng.randint(3, 8))[:-1],
+            "slug": f"post-{i}",
+            "content": doc,
+            "status": "draft" if is_draft else "published",
+            "author_id": data.author_id,
+            "published_at": None if is_draft else stamp,
+            "created_at": stamp,
+            "updated_at": stamp,
+            "cover_image_url": f"https://cdn.example.com/covers/{i}.jpg",
+            **_document_columns(doc),
+        })
+        for tag in rng.sample(tags, rng.randint(1, 4)):
+            db.insert("blog_post_tags", {"post_id": post["id"], "tag_id": tag["id"]})
+        if is_draft:
+            data.draft_ids.append(post["id"])
+        else:
+            published.append(post)
+            data.post_slugs.append(post["slug"])
+
+    for i in range(experiences):
+        doc = make_document(rng, 6)
+        experience = db.insert("work_experiences", {
+            "title": _sentence(rng, 3)[:-1],
+            "slug": f"experience-{i}",
+            "subtitle": _sentence(rng, 6),
+            "description": doc,
+            "description_html": render_html(doc),
+            "sort_order": i,
+        })
+        data.experience_slugs.append(experience["slug"])
+        for j in range(rng.randint(4, 12)):
+            db.insert("work_timeline_events", {
+                "experience_id": experience["id"],
+                "event_date": (date(2020, 1, 1) + timedelta(days=45 * j)).isoformat(),
+                "title": _sentence(rng, 4)[:-1],
+                "sort_order": j,
+            })
+        for j, post in enumerate(rng.sample(published, min(len(published), 4))):
+            db.insert("work_featured_posts", {
+                "experience_id": experience["id"], "post_id": post["id"], "sort_order": j,
+            })
+
+    for i in range(portfolio_items):
+        db.insert("portfolio_items", {
+            "title": _sentence(rng, 3)[:-1],
+            "media_type": "video" if i % 7 == 0 else "photo",
+            "media_url": f"https://cdn.example.com/portfolio/{i}.jpg",
+            "category": rng.choice(("film", "sport", "travel")),
+            "sort_order": i * 1024,
+            "is_featured": i % 5 == 0,
+        })
+
+    for i in range(influences):
+        db.insert("influences", {
+            "title": _sentence(rng, 3)[:-1],
+            "category": rng.choice(("book", "podcast", "creator")),
+            "author": _sentence(rng, 2)[:-1],
+            "sort_order": i,
+        })
+    return data
@@ -0,0 +1,186 @@
+import asyncio
+import functools
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _size(value) -> int:
+    """Estimated size of a cached value: its JSON length, or its own
+    `cache_size()` for objects such as SearchIndex that JSON can't size."""
+    estimate = getattr(value, "cache_size", None)
+    return estimate() if callable(estimate) else len(json.dumps(value, default=str))
+
+
+class TTLCache:
+    """In-process LRU cache with per-entry TTL, tag invalidation and a size budget.
+
+    Entries are evicted least-recently-used first once either `max_entries`
+    or `max_bytes` (an estimate based on the JSON size of each value, see
+    _size) is exceeded. Each entry carries a set of tags so writers can drop every
+    entry derived from the data they changed. With `stale_ttl`, expired
+    entries are kept that much longer for `lookup` to serve while they are
+    refreshed; `get` never returns them.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float, stale_ttl: float = 0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires, size, tags, value)
+        self._bytes = 0
+        # Bumped on every invalidation so a read that started before a write
+        # can tell its result may be stale and skip storing it.
+        self.generation = 0
+
+    def get(self, key, default=None):
+        value, fresh = self.lookup(key, default)
+        return value if fresh else default
+
+    def lookup(self, key, default=None) -> tuple:
+        """(value, fresh): an expired entry still within `stale_ttl` comes
+        back with fresh=False; a missing one as (default, False)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default, False
+        now = time.monotonic()
+        if entry[0] + self.stale_ttl <= now:
+            self._remove(key)
+            return default, False
+        self._entries.move_to_end(key)
+        return entry[3], entry[0] > now
+
+    def set(self, key, value, tags: tuple[str, ...] = (), ttl: float | None = None):
+        size = _size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires, size, frozenset(tags), value)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, *tags: str) -> list:
+        """Drop every entry carrying any of the given tags.
+
+        Returns the dropped keys, least recently used first.
+        """
+        self.generation += 1
+        stale = [key for key, entry in self._entries.items() if entry[2] & set(tags)]
+        for key in stale:
+            self._remove(key)
+        return stale
+
+    def clear(self):
+        self.generation += 1
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+public_cache = TTLCache(
+    max_entries=settings.cache_max_entries,
+    max_bytes=settings.cache_max_bytes,
+    ttl=settings.cache_ttl_seconds,
+    stale_ttl=settings.cache_stale_seconds,
+)
+
+_MISSING = object()
+
+# Loads in progress, keyed by (cache key, cache generation at start)
+_inflight: dict[tuple, asyncio.Task] = {}
+
+# @cached functions by (module, qualname), the start of their cache keys
+_loaders: dict[tuple[str, str], Callable] = {}
+
+
+def _single_flight(flight: tuple, load) -> asyncio.Task:
+    """The running task for `flight`, starting `load()` if there is none."""
+    task = _inflight.get(flight)
+    if task is None:
+        task = asyncio.ensure_future(load())
+        _inflight[flight] = task
+
+        def done(finished: asyncio.Task):
+            if _inflight.get(flight) is finished:
+                del _inflight[flight]
+            if not finished.cancelled():
+                finished.exception()  # background refreshes have no awaiter to report to
+
+        task.add_done_callback(done)
+    return task
+
+
+def cached(*tags: str, ttl: float | None = None):
+    """Cache an async endpoint's result in `public_cache`.
+
+    The key is the endpoint plus its (query/path) arguments. Cached values
+    are shared between requests and must be treated as read-only.
+
+    Concurrent misses for one key share a single call (single-flight), so a
+    traffic spike on a cold key costs one upstream query. An entry past its
+    TTL but within `cache_stale_seconds` is served as is while one
+    background call refreshes it. Invalidated entries are gone, not stale,
+    so reads after a write always wait for fresh data.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = (fn.__module__, fn.__qualname__, args, tuple(sorted(kwargs.items())))
+            value, fresh = public_cache.lookup(key, _MISSING)
+            if fresh:
+                return value
+
+            generation = public_cache.generation
+
+            async def load():
+                loaded = await fn(*args, **kwargs)
+                if public_cache.generation == generation:
+                    public_cache.set(key, loaded, tags=tags, ttl=ttl)
+                return loaded
+
+            # Only join loads started since the last invalidation
+            task = _single_flight((key, generation), load)
+            if value is not _MISSING:
+                return value
+            # Shielded so one client disconnecting doesn't cancel the others' load
+            return await asyncio.shield(task)
+
+        _loaders[(fn.__module__, fn.__qualname__)] = wrapper
+        return wrapper
+
+    return decorator
+
+
+async def rewarm(keys: list, limit: int = 32):
+    """Reload up to `limit` of the given public_cache keys, most recent first.
+
+    Used after an invalidation so the next readers find the entries they
+    were just using already fresh. Failures are logged and skipped.
+    """
+    warmed, calls = [], []
+    for key in reversed(keys[-limit:]):
+        module, qualname, args, kwargs = key
+        loader = _loaders.get((module, qualname))
+        if loader is not None:
+            warmed.append(key)
+            calls.append(loader(*args, **dict(kwargs)))
+    for key, result in zip(warmed, await asyncio.gather(*calls, return_exceptions=True)):
+        if isinstance(result, Exception):
+            logger.warning("Could not rewarm %s.%s: %s", key[0], key[1], result)
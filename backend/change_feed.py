@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from realtime import RealtimeSubscribeStates
+from cache import public_cache, rewarm
+from config import settings
+from supabase_client import supabase
+
+logger = logging.getLogger(__name__)
+
+# Tables behind the public responses -> the public_cache tags built from them
+TABLE_TAGS = {
+    "blog_posts": ("blog_posts",),
+    "blog_post_tags": ("blog_posts",),
+    "blog_tags": ("blog_tags", "blog_posts"),
+    "portfolio_items": ("portfolio",),
+    "work_experiences": ("work",),
+    "work_timeline_events": ("work",),
+    "work_featured_posts": ("work",),
+    "influences": ("influences",),
+    "site_settings": ("settings",),
+}
+
+# Tables with an updated_at column; the poller watches only the row count of
+# the others, so it can miss e.g. a post's tags being swapped one for one.
+UPDATED_AT_TABLES = {
+    "blog_posts",
+    "portfolio_items",
+    "work_experiences",
+    "work_timeline_events",
+    "influences",
+    "site_settings",
+}
+
+# Columns matched against the ids the API wrote, for tables not matched on
+# `id` alone. Child rows also match on their parent's id, so one write covers
+# rows the API never sees: those a sync or cascade deletes, and join rows
+# without an id. Their DELETE events carry these columns because the tables
+# have REPLICA IDENTITY FULL (or, for blog_post_tags, they are the key).
+MATCH_COLUMNS = {
+    "blog_post_tags": ("post_id", "tag_id"),
+    "work_timeline_events": ("id", "experience_id"),
+    "work_featured_posts": ("id", "experience_id", "post_id"),
+}
+
+# Row events arriving within this window are applied as one invalidation
+DEBOUNCE_SECONDS = 0.5
+
+# How many rows written through the API are remembered for echo matching
+EXPECTED_ROWS = 256
+
+# How long a write's echo is waited for; later events are treated as edits
+EXPECT_SECONDS = 10
+
+
+def _version(updated_at) -> datetime | None:
+    """updated_at as a comparable value; Realtime and PostgREST format it differently."""
+    try:
+        return datetime.fromisoformat(updated_at)
+    except (TypeError, ValueError):
+        return None
+
+
+class ChangeFeed:
+    """Keeps public_cache in step with edits made outside the API.
+
+    Rows changed from the Supabase dashboard or SQL editor never pass
+    through the admin endpoints, so nothing would invalidate their cached
+    responses. In "realtime" mode this subscribes to Postgres changes on
+    the TABLE_TAGS tables (they must be in the supabase_realtime
+    publication, see supabase_schema.sql) and falls back to polling if the
+    channel can't be joined. "poll" mode compares each table's row count
+    and newest `updated_at` every `poll_seconds`. Either way, changed tables
+    invalidate their tags and the hottest dropped entries are reloaded.
+
+    Admin endpoints invalidate for their own writes through `wrote`, which
+    also remembers the rows; Realtime events for them are their echo and are
+    skipped, so an autosave doesn't invalidate and rewarm twice.
+    """
+
+    def __init__(self, mode: str, poll_seconds: float):
+        self.mode = mode
+        self.poll_seconds = poll_seconds
+        self._changed: set[str] = set()
+        self._wake = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._channel = None
+        self._polling = False
+        self._subscribed_once = False
+        self._marks: dict[str, tuple] = {}
+        self._expected: OrderedDict[tuple[str, str], tuple[datetime | None, float]] = OrderedDict()
+
+    def notify(self, table: str):
+        """Record a change to `table`; applied after DEBOUNCE_SECONDS."""
+        if table in TABLE_TAGS:
+            self._changed.add(table)
+            self._wake.set()
+
+    def wrote(self, table: str, rows: list[dict] = (), ids: list = ()):
+        """Invalidate for an API write to `table` and skip its Realtime echo.
+
+        `rows` are the written rows: those with `updated_at` only match events
+        carrying that version. `ids` (deleted rows, or the parent of synced or
+        cascaded child rows, see MATCH_COLUMNS) match any event for a while.
+        """
+        public_cache.invalidate(*TABLE_TAGS[table])
+        deadline = time.monotonic() + EXPECT_SECONDS
+        expected = [(row["id"], _version(row.get("updated_at"))) for row in rows]
+        expected += [(row_id, None) for row_id in ids]
+        for row_id, version in expected:
+            key = (table, str(row_id))
+            self._expected[key] = (version, deadline)
+            self._expected.move_to_end(key)
+        while len(self._expected) > EXPECTED_ROWS:
+            self._expected.popitem(last=False)
+
+    async def start(self):
+        if self.mode == "off":
+            return
+        self._tasks.append(asyncio.create_task(self._apply()))
+        if self.mode == "realtime":
+            # Joining can take several connection retries; don't hold up startup
+            self._tasks.append(asyncio.create_task(self._subscribe()))
+        else:
+            self._start_polling()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._channel is not None:
+            try:
+                await supabase.remove_channel(self._channel)
+            except Exception:
+                logger.debug("Could not close the change feed channel", exc_info=True)
+            self._channel = None
+
+    # --- Realtime ---
+
+    async def _subscribe(self):
+        try:
+            channel = supabase.channel("api-cache-invalidation")
+            for table in TABLE_TAGS:
+                channel.on_postgres_changes(
+                    "*", schema="public", table=table, callback=self._on_change
+                )
+            self._channel = await channel.subscribe(self._on_state)
+        except Exception:
+            logger.warning("Realtime change feed unavailable, polling instead", exc_info=True)
+            self._start_polling()
+
+    def _on_change(self, payload: dict):
+        data = payload["data"]
+        table = data["table"]
+        # DELETE events carry the key columns in old_record instead
+        record = data.get("record") or data.get("old_record") or {}
+        version = _version(record.get("updated_at"))
+        now = time.monotonic()
+        for column in MATCH_COLUMNS.get(table, ("id",)):
+            expected = self._expected.get((table, str(record.get(column))))
+            if expected and now < expected[1] and expected[0] in (None, version):
+                return
+        self.notify(table)
+
+    def _on_state(self, state: RealtimeSubscribeStates, error: Exception | None):
+        if state == RealtimeSubscribeStates.SUBSCRIBED:
+            if self._subscribed_once:
+                # Changes made while disconnected were missed; assume the worst
+                for table in TABLE_TAGS:
+                    self.notify(table)
+            self._subscribed_once = True
+        elif state in (RealtimeSubscribeStates.CHANNEL_ERROR, RealtimeSubscribeStates.TIMED_OUT):
+            logger.warning("Realtime change feed %s (%s), polling instead", state.value, error)
+            self._start_polling()
+
+    # --- Polling ---
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self._tasks.append(asyncio.create_task(self._poll()))
+
+    async def _mark(self, table: str) -> tuple:
+        """(row count, newest updated_at) of a table."""
+        has_updated_at = table in UPDATED_AT_TABLES
+        query = supabase.table(table).select("updated_at" if has_updated_at else "*", count="exact")
+        if has_updated_at:
+            query = query.order("updated_at", desc=True)
+        result = await query.limit(1).execute()
+        newest = result.data[0]["updated_at"] if has_updated_at and result.data else None
+        return result.count, newest
+
+    async def _poll(self):
+        while True:
+            tables = list(TABLE_TAGS)
+            marks = await asyncio.gather(*(self._mark(t) for t in tables), return_exceptions=True)
+            for table, mark in zip(tables, marks):
+                if isinstance(mark, Exception):
+                    logger.warning("Could not poll %s: %s", table, mark)
+                    continue
+                # The first poll only records where each table starts
+                if table in self._marks and self._marks[table] != mark:
+                    self.notify(table)
+                self._marks[table] = mark
+            await asyncio.sleep(self.poll_seconds)
+
+    # --- Applying changes ---
+
+    async def _apply(self):
+        while True:
+            await self._wake.wait()
+            await asyncio.sleep(DEBOUNCE_SECONDS)
+            self._wake.clear()
+            tables, self._changed = self._changed, set()
+            tags = {tag for table in tables for tag in TABLE_TAGS[table]}
+            logger.info("Tables changed: %s; invalidating %s", sorted(tables), sorted(tags))
+            await rewarm(public_cache.invalidate(*tags))
+
+
+change_feed = ChangeFeed(settings.change_feed, settings.change_feed_poll_seconds)
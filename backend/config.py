@@ -5,7 +5,22 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_service_role_key: str
     supabase_jwt_secret: str
+    supabase_jwks_url: str = ""
     cors_origins: str = "http://localhost:5173"
+    cache_ttl_seconds: float = 300
+    # How long past its TTL a cached response may still be served while it
+    # is refreshed in the background
+    cache_stale_seconds: float = 3600
+    cache_max_entries: int = 512
+    cache_max_bytes: int = 16 * 1024 * 1024
+    # "postgres" uses the search functions in supabase_schema.sql; "memory"
+    # builds an in-process index instead, for local development.
+    search_backend: str = "postgres"
+    # How edits made outside the API reach the cache: "realtime" (Postgres
+    # changes over Supabase Realtime), "poll" (every change_feed_poll_seconds,
+    # e.g. for local development) or "off"
+    change_feed: str = "realtime"
+    change_feed_poll_seconds: float = 10
 
     @property
     def cors_origins_list(self) -> list[str]:
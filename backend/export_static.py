@@ -0,0 +1,268 @@
+"""Export the public API as static JSON (and optionally HTML) files.
+
+Run from backend/:
+
+    python export_static.py [--out DIR] [--html] [--full]
+
+Each file mirrors a public endpoint (see PATHS below). Runs are incremental:
+manifest.json records the newest post `updated_at` exported and a hash of
+each post's tags, and only posts changed since then (including tag edits,
+renames and deletions) are fetched again. Every file is rewritten only
+when its content changed, and the manifest maps each file to a content
+hash that clients can use as a `?v=` cache buster. Use --full to rebuild
+everything regardless.
+
+This is a manual step: it isn't part of the Netlify build (which has no
+Supabase credentials) and the frontend doesn't read the snapshot, so it
+always calls the API. The default output, backend/export/, is outside
+frontend/public/ so the snapshot is never shipped with the site.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import sys
+from datetime import datetime, timezone
+from html import escape
+from pathlib import Path
+from http_cache import validators
+from supabase_client import close_supabase, open_supabase, supabase
+from routes.blog import POST_LIST_SELECT, TAGS_EMBED, _enrich_posts, _load_published_posts, _load_tags
+from routes.bootstrap import _load_bootstrap
+from routes.influences import INFLUENCE_LIST_COLUMNS, _load_influences
+from routes.portfolio import PORTFOLIO_LIST_COLUMNS, _load_categories, _load_items
+from routes.settings import _load_settings
+from routes.work import EXPERIENCE_LIST_COLUMNS, _load_experience, _load_experiences
+
+DEFAULT_OUT = Path(__file__).resolve().parent / "export"
+MANIFEST = "manifest.json"
+POST_BATCH = 50
+
+# Slugs become file names; anything else (e.g. "../x") is skipped
+SAFE_SLUG = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]*")
+
+# Static file -> the endpoint it mirrors
+PATHS = {
+    "bootstrap.json": "/api/bootstrap",
+    "settings.json": "/api/settings",
+    "posts/index.json": "/api/blog/posts (every published post card)",
+    "posts/{slug}.json": "/api/blog/posts/{slug}",
+    "tags.json": "/api/blog/tags",
+    "experiences/index.json": "/api/work/experiences",
+    "experiences/{slug}.json": "/api/work/experiences/{slug}",
+    "portfolio/index.json": "/api/portfolio/items",
+    "portfolio/categories.json": "/api/portfolio/categories",
+    "influences.json": "/api/influences/",
+}
+
+POST_HTML = """<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<meta name="description" content="{description}">
+<link rel="canonical" href="/blog/{slug}">
+</head>
+<body>
+<article>
+<h1>{title}</h1>
+{body}
+</article>
+</body>
+</html>
+"""
+
+
+def _parse(timestamp: str) -> datetime:
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+
+
+def _safe_slug(slug: str, kind: str) -> bool:
+    if SAFE_SLUG.fullmatch(slug or ""):
+        return True
+    print(f"Skipping {kind} with unsafe slug {slug!r}", file=sys.stderr)
+    return False
+
+
+def _tags_hash(row: dict) -> str:
+    """Hash of a post's tags, which its updated_at doesn't cover."""
+    tags = sorted(
+        (link["blog_tags"]["id"], link["blog_tags"]["name"], link["blog_tags"]["slug"])
+        for link in row.get("blog_post_tags") or []
+        if link.get("blog_tags")
+    )
+    return hashlib.sha256(json.dumps(tags).encode()).hexdigest()[:16]
+
+
+class Snapshot:
+    """The export directory plus the manifest of what is already in it."""
+
+    def __init__(self, out: Path, full: bool):
+        self.out = out
+        previous = {}
+        if (out / MANIFEST).exists():
+            previous = json.loads((out / MANIFEST).read_text())
+        self.version = previous.get("version", 0)
+        # A full run refetches everything; unchanged files are still skipped
+        self.watermark = None if full else previous.get("watermark")
+        self.old_files: dict[str, str] = previous.get("files", {})
+        self.files: dict[str, str] = {}
+        self.old_post_tags: dict[str, str] = previous.get("post_tags", {})
+        self.post_tags: dict[str, str] = {}
+        self.written = 0
+
+    def _path(self, rel: str) -> Path:
+        """`rel` under the output directory; refuses paths that escape it."""
+        path = (self.out / rel).resolve()
+        if not path.is_relative_to(self.out.resolve()):
+            raise ValueError(f"{rel!r} is outside {self.out}")
+        return path
+
+    def _put(self, rel: str, text: str, digest: str):
+        path = self._path(rel)
+        self.files[rel] = digest
+        if self.old_files.get(rel) == digest and path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        self.written += 1
+
+    def write_json(self, rel: str, content):
+        etag, _ = validators(content)
+        self._put(rel, json.dumps(content, separators=(",", ":")), etag.strip('"'))
+
+    def write_html(self, rel: str, text: str):
+        self._put(rel, text, hashlib.sha256(text.encode()).hexdigest()[:32])
+
+    def keep(self, rel: str):
+        """Carry an unchanged file over without regenerating it."""
+        if rel in self.old_files and self._path(rel).exists():
+            self.files[rel] = self.old_files[rel]
+
+    def finish(self, watermark: str | None) -> int:
+        """Delete files no longer exported and write the manifest."""
+        removed = 0
+        for rel in set(self.old_files) - set(self.files):
+            self._path(rel).unlink(missing_ok=True)
+            removed += 1
+        if self.written or removed or watermark != self.watermark:
+            self.version += 1
+        manifest = {
+            "version": self.version,
+            "watermark": watermark,
+            "post_tags": dict(sorted(self.post_tags.items())),
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "files": dict(sorted(self.files.items())),
+        }
+        (self.out / MANIFEST).write_text(json.dumps(manifest, indent=2))
+        return removed
+
+
+async def _export_posts(snapshot: Snapshot, html: bool) -> str | None:
+    """Write every published post that changed since the last watermark."""
+    result = await (
+        supabase.table("blog_posts")
+        .select(f"slug, updated_at, {TAGS_EMBED}")
+        .eq("status", "published")
+        .execute()
+    )
+    published = [row for row in result.data if _safe_slug(row["slug"], "post")]
+    since = _parse(snapshot.watermark) if snapshot.watermark else None
+
+    stale = []
+    for row in published:
+        rel = f"posts/{row['slug']}.json"
+        html_rel = f"html/posts/{row['slug']}.html"
+        tags = snapshot.post_tags[row["slug"]] = _tags_hash(row)
+        missing = rel not in snapshot.old_files or (html and html_rel not in snapshot.old_files)
+        retagged = snapshot.old_post_tags.get(row["slug"]) != tags
+        if since is None or missing or retagged or _parse(row["updated_at"]) > since:
+            stale.append(row["slug"])
+        else:
+            snapshot.keep(rel)
+            if html:
+                snapshot.keep(html_rel)
+
+    for start in range(0, len(stale), POST_BATCH):
+        for post in await _load_published_posts(stale[start:start + POST_BATCH]):
+            snapshot.write_json(f"posts/{post['slug']}.json", post)
+            if html:
+                snapshot.write_html(
+                    f"html/posts/{post['slug']}.html",
+                    POST_HTML.format(
+                        title=escape(post.get("meta_title") or post["title"]),
+                        description=escape(post.get("meta_description") or post.get("excerpt") or ""),
+                        slug=escape(post["slug"]),
+                        body=post.get("content_html") or "",
+                    ),
+                )
+
+    stamps = [row["updated_at"] for row in published]
+    return max(stamps, key=_parse) if stamps else snapshot.watermark
+
+
+async def _export_lists(snapshot: Snapshot):
+    cards = await (
+        supabase.table("blog_posts")
+        .select(POST_LIST_SELECT)
+        .eq("status", "published")
+        .order("published_at", desc=True, nullsfirst=False)
+        .order("id", desc=True)
+        .execute()
+    )
+    (
+        bootstrap, settings, tags, experiences, portfolio, categories, influences,
+    ) = await asyncio.gather(
+        _load_bootstrap(),
+        _load_settings(),
+        _load_tags(),
+        _load_experiences(EXPERIENCE_LIST_COLUMNS),
+        _load_items(None, None, False, PORTFOLIO_LIST_COLUMNS),
+        _load_categories(),
+        _load_influences(None, INFLUENCE_LIST_COLUMNS),
+    )
+    snapshot.write_json("posts/index.json", await _enrich_posts(cards.data))
+    snapshot.write_json("bootstrap.json", bootstrap)
+    snapshot.write_json("settings.json", settings)
+    snapshot.write_json("tags.json", tags)
+    snapshot.write_json("experiences/index.json", experiences)
+    snapshot.write_json("portfolio/index.json", portfolio)
+    snapshot.write_json("portfolio/categories.json", categories)
+    snapshot.write_json("influences.json", influences)
+
+    # Experience pages embed timelines and featured posts, which carry no
+    # watermark of their own, so they are rebuilt (and compared) every run.
+    details = await asyncio.gather(*(_load_experience(e["slug"]) for e in experiences))
+    for experience in details:
+        if experience is not None and _safe_slug(experience["slug"], "experience"):
+            snapshot.write_json(f"experiences/{experience['slug']}.json", experience)
+
+
+async def export(out: Path, html: bool, full: bool):
+    snapshot = Snapshot(out, full)
+    await open_supabase()
+    try:
+        watermark = await _export_posts(snapshot, html)
+        await _export_lists(snapshot)
+    finally:
+        await close_supabase()
+    removed = snapshot.finish(watermark)
+    print(
+        f"Snapshot v{snapshot.version} in {out}: {len(snapshot.files)} files, "
+        f"{snapshot.written} written, {removed} removed"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export public content as static files.")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="output directory")
+    parser.add_argument("--html", action="store_true", help="also write HTML for each post")
+    parser.add_argument("--full", action="store_true", help="ignore the manifest and rebuild everything")
+    args = parser.parse_args()
+    asyncio.run(export(args.out, args.html, args.full))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+# Cache-Control policies for public endpoints. Browsers revalidate after
+# max-age; shared caches may serve a stale copy while they refetch.
+CACHE_LIST = "public, max-age=60, stale-while-revalidate=300"
+CACHE_DETAIL = "public, max-age=300, stale-while-revalidate=3600"
+CACHE_SETTINGS = "public, max-age=300, stale-while-revalidate=86400"
+
+
+# Row fields that can change without bumping the row's own updated_at, e.g.
+# a featured post's sort_order lives on the work_featured_posts link row.
+ORDER_FIELDS = ("sort_order",)
+
+
+def _collect_versions(value, parts: list[str], stamps: list[str]):
+    """Walk a payload collecting row version data.
+
+    Rows that carry `updated_at` contribute `id@updated_at` (the trigger in
+    supabase_schema.sql bumps it on every update) plus their ORDER_FIELDS;
+    their nested relations are still walked. Rows without one, e.g. tags,
+    contribute their contents.
+    """
+    if isinstance(value, dict):
+        if value.get("updated_at"):
+            parts.append(f"{value.get('id')}@{value['updated_at']}")
+            parts.extend(repr(value.get(field)) for field in ORDER_FIELDS)
+            stamps.append(value["updated_at"])
+            for nested in value.values():
+                if isinstance(nested, (list, dict)):
+                    _collect_versions(nested, parts, stamps)
+        else:
+            for key in sorted(value):
+                parts.append(key)
+                _collect_versions(value[key], parts, stamps)
+    elif isinstance(value, list):
+        parts.append(f"[{len(value)}")
+        for item in value:
+            _collect_versions(item, parts, stamps)
+        parts.append("]")
+    else:
+        parts.append(repr(value))
+
+
+def _parse_timestamp(value: str) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def validators(content) -> tuple[str, datetime | None]:
+    """Return a strong ETag and the Last-Modified time for a payload.
+
+    Last-Modified is only given for a single row (a dict with its own
+    `updated_at`) without nested lists. Removing an item from a list, e.g.
+    a post's tag or an experience's timeline event, doesn't move the newest
+    `updated_at`, so anything with a list is validated by ETag alone.
+    """
+    parts: list[str] = []
+    stamps: list[str] = []
+    _collect_versions(content, parts, stamps)
+    digest = hashlib.sha256("\x1f".join(parts).encode()).hexdigest()[:32]
+    single_row = isinstance(content, dict) and content.get("updated_at")
+    if not single_row or any(isinstance(value, list) for value in content.values()):
+        return f'"{digest}"', None
+    parsed = [ts for ts in (_parse_timestamp(s) for s in stamps) if ts is not None]
+    return f'"{digest}"', max(parsed) if parsed else None
+
+
+def _not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def conditional_response(request: Request, content, cache_control: str) -> Response:
+    """Serve `content` as JSON, or a bodiless 304 if the client's copy is current."""
+    etag, last_modified = validators(content)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content, headers=headers)
@@ -0,0 +1,161 @@
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import PurePosixPath
+from PIL import Image, ImageOps, features
+from storage3.exceptions import StorageApiError
+from supabase_client import supabase
+from upload_stream import IMMUTABLE_CACHE_SECONDS
+
+# Widths generated for responsive images; none are upscaled beyond the original.
+VARIANT_WIDTHS = (320, 640, 1024, 1600)
+VARIANT_QUALITY = {"webp": 80, "avif": 55}
+
+# GIFs are left alone so animations survive.
+PROCESSABLE_TYPES = {"image/jpeg", "image/png", "image/webp"}
+
+# Storage extension for each accepted upload format, as Pillow names it
+IMAGE_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "GIF": "gif"}
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def _formats() -> list[str]:
+    return ["avif", "webp"] if features.check("avif") else ["webp"]
+
+
+def _variant_widths(width: int) -> list[int]:
+    largest = min(width, VARIANT_WIDTHS[-1])
+    return [w for w in VARIANT_WIDTHS if w < largest] + [largest]
+
+
+def image_extension(file) -> str | None:
+    """Extension for an image from its header, or None if it isn't an accepted format."""
+    try:
+        with Image.open(file, formats=list(IMAGE_EXTENSIONS)) as image:
+            return IMAGE_EXTENSIONS[image.format]
+    except (OSError, ValueError):
+        return None
+
+
+def _display_size(data: bytes) -> tuple[int, int]:
+    """Upright width/height from the image header, without decoding pixels."""
+    with Image.open(io.BytesIO(data)) as image:
+        width, height = image.size
+        # EXIF orientations 5-8 are rotated by 90 degrees
+        if image.getexif().get(0x0112) in (5, 6, 7, 8):
+            width, height = height, width
+    return width, height
+
+
+def _render_variants(data: bytes, formats: list[str]) -> tuple[int, int, list[tuple[str, int, bytes]]]:
+    """Decode an image and encode it at each variant width and format.
+
+    Runs in a worker process. Re-encoding drops EXIF/XMP metadata; the
+    EXIF orientation is applied first so variants display upright.
+    """
+    with Image.open(io.BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            # LA/PA/P-with-transparency keep their alpha; RGB would fill it black
+            image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+        width, height = image.size
+
+        variants = []
+        for target in _variant_widths(width):
+            resized = image
+            if target != width:
+                resized = image.resize(
+                    (target, round(height * target / width)), Image.Resampling.LANCZOS
+                )
+            for fmt in formats:
+                out = io.BytesIO()
+                resized.save(out, format=fmt.upper(), quality=VARIANT_QUALITY[fmt])
+                variants.append((fmt, target, out.getvalue()))
+    return width, height, variants
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=2)
+    return _executor
+
+
+def shutdown_executor():
+    """Stop the worker processes. Called on app shutdown."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+    _executor = None
+
+
+def _variant_path(stem: str, fmt: str, target: int) -> str:
+    return f"{stem}-{target}w.{fmt}"
+
+
+async def _stored_variants(storage, stem: str) -> set[str]:
+    """Paths of the variants already stored for `stem`, from one storage listing."""
+    folder = str(PurePosixPath(stem).parent)
+    folder = "" if folder == "." else folder
+    listed = await storage.list(folder, {"search": f"{PurePosixPath(stem).name}-", "limit": 100})
+    return {str(PurePosixPath(folder, entry["name"])) for entry in listed}
+
+
+async def create_variants(bucket: str, path: str, data: bytes, existing: bool = False) -> dict:
+    """Store resized WebP/AVIF copies of an uploaded image next to the original.
+
+    Returns the original's dimensions and a `srcset` string per MIME type,
+    ready for `<picture><source type=... srcset=...>`, or an empty dict if
+    the image can't be decoded. When the original already `existing` in
+    storage (a deduplicated upload) its variants are listed and only the
+    missing ones, e.g. left out by an interrupted upload, are rendered.
+    """
+    stem = str(PurePosixPath(path).with_suffix(""))
+    storage = supabase.storage.from_(bucket)
+    try:
+        missing = True
+        if existing:
+            width, height = _display_size(data)
+            present = await _stored_variants(storage, stem)
+            variants = [
+                (fmt, target, None) for target in _variant_widths(width) for fmt in _formats()
+            ]
+            missing = any(_variant_path(stem, fmt, target) not in present for fmt, target, _ in variants)
+        if missing:
+            loop = asyncio.get_running_loop()
+            width, height, variants = await loop.run_in_executor(
+                _get_executor(), _render_variants, data, _formats()
+            )
+            if existing:
+                variants = [
+                    (fmt, target, None if _variant_path(stem, fmt, target) in present else content)
+                    for fmt, target, content in variants
+                ]
+    except (OSError, Image.DecompressionBombError):
+        return {}
+
+    async def store(fmt: str, target: int, content: bytes | None) -> tuple[str, int, str]:
+        variant_path = _variant_path(stem, fmt, target)
+        if content is not None:
+            try:
+                await storage.upload(
+                    variant_path,
+                    content,
+                    {"content-type": f"image/{fmt}", "cache-control": IMMUTABLE_CACHE_SECONDS},
+                )
+            except StorageApiError as exc:
+                if str(exc.status) != "409":
+                    raise
+        return fmt, target, await storage.get_public_url(variant_path)
+
+    stored = await asyncio.gather(*(store(*v) for v in variants))
+
+    srcset: dict[str, list[str]] = {}
+    for fmt, target, url in stored:
+        srcset.setdefault(f"image/{fmt}", []).append(f"{url} {target}w")
+    return {
+        "width": width,
+        "height": height,
+        "srcset": {mime: ", ".join(entries) for mime, entries in srcset.items()},
+    }
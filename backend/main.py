@@ -1,15 +1,39 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from config import settings
+from supabase_client import open_supabase, close_supabase
+from upload_stream import BodySizeLimitMiddleware
+from metrics import MetricsMiddleware, register_router, render_metrics
+from image_variants import shutdown_executor
+from change_feed import change_feed
 from routes.auth import router as auth_router
 from routes.blog import router as blog_router
 from routes.portfolio import router as portfolio_router
 from routes.work import router as work_router
-from routes.upload import router as upload_router
+from routes.upload import router as upload_router, UPLOAD_BODY_LIMITS
 from routes.settings import router as settings_router
 from routes.influences import router as influences_router
+from routes.bootstrap import router as bootstrap_router
 
-app = FastAPI(title="Blake Wellington Portfolio API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await open_supabase()
+    await change_feed.start()
+    yield
+    await change_feed.stop()
+    await close_supabase()
+    shutdown_executor()
+
+
+app = FastAPI(title="Blake Wellington Portfolio API", lifespan=lifespan)
+
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={f"/api/upload{path}": size for path, size in UPLOAD_BODY_LIMITS.items()},
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,17 +41,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
-app.include_router(auth_router, prefix="/api/auth", tags=["Auth"])
-app.include_router(blog_router, prefix="/api/blog", tags=["Blog"])
-app.include_router(portfolio_router, prefix="/api/portfolio", tags=["Portfolio"])
-app.include_router(work_router, prefix="/api/work", tags=["Work"])
-app.include_router(upload_router, prefix="/api/upload", tags=["Upload"])
-app.include_router(settings_router, prefix="/api/settings", tags=["Settings"])
-app.include_router(influences_router, prefix="/api/influences", tags=["Influences"])
+# Added last so it is outermost and times everything, including CORS
+app.add_middleware(MetricsMiddleware)
 
+ROUTERS = (
+    (auth_router, "/api/auth", "Auth"),
+    (blog_router, "/api/blog", "Blog"),
+    (portfolio_router, "/api/portfolio", "Portfolio"),
+    (work_router, "/api/work", "Work"),
+    (upload_router, "/api/upload", "Upload"),
+    (settings_router, "/api/settings", "Settings"),
+    (influences_router, "/api/influences", "Influences"),
+    (bootstrap_router, "/api/bootstrap", "Bootstrap"),
+)
+for router, prefix, tag in ROUTERS:
+    app.include_router(router, prefix=prefix, tags=[tag])
+    register_router(router, prefix)
 
 @app.get("/")
 def root():
     return {"message": "Backend is running"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint for this worker's request metrics."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
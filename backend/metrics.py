@@ -0,0 +1,219 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import httpx
+
+# Request and upstream (Supabase) instrumentation. The middleware times each
+# request and adds a Server-Timing header; hooks on the pooled httpx client
+# attribute every PostgREST/storage/auth call to the request that made it.
+# Metrics are per process: with several workers, scrape each one.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+CALL_BUCKETS = (0, 1, 2, 3, 4, 6, 8, 12, 16, 32)
+
+# First path segment after the Supabase host -> service label
+UPSTREAM_SERVICES = {"rest": "postgrest", "storage": "storage", "auth": "auth"}
+
+
+class Histogram:
+    """Prometheus histogram with cumulative buckets, keyed by label values."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], buckets: tuple):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], list[float]] = {}  # bucket counts..., sum, count
+
+    def observe(self, value: float, *label_values: str):
+        series = self._series.setdefault(label_values, [0] * (len(self.buckets) + 2))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(self._series.items()):
+            pairs = [f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values)]
+            for bound, count in zip((*self.buckets, "+Inf"), (*series[:-2], series[-1])):
+                le = ",".join([*pairs, f'le="{bound}"'])
+                lines.append(f"{self.name}_bucket{{{le}}} {count}")
+            base = ",".join(pairs)
+            lines.append(f"{self.name}_sum{{{base}}} {series[-2]}")
+            lines.append(f"{self.name}_count{{{base}}} {series[-1]}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to handle a request.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Response body size.", ("method", "route"), SIZE_BUCKETS
+)
+REQUEST_UPSTREAM_CALLS = Histogram(
+    "http_request_upstream_calls",
+    "Supabase calls made while handling one request.",
+    ("method", "route"),
+    CALL_BUCKETS,
+)
+UPSTREAM_DURATION = Histogram(
+    "upstream_request_duration_seconds",
+    "Time until a Supabase call's response headers arrive.",
+    ("service",),
+    LATENCY_BUCKETS,
+)
+UPSTREAM_RESPONSE_SIZE = Histogram(
+    "upstream_response_size_bytes",
+    "Supabase response size, where Content-Length is given.",
+    ("service",),
+    SIZE_BUCKETS,
+)
+HISTOGRAMS = (
+    REQUEST_DURATION,
+    RESPONSE_SIZE,
+    REQUEST_UPSTREAM_CALLS,
+    UPSTREAM_DURATION,
+    UPSTREAM_RESPONSE_SIZE,
+)
+
+
+@dataclass
+class RequestStats:
+    """Upstream calls made on behalf of one request, per service."""
+
+    calls: dict[str, int] = field(default_factory=dict)
+    seconds: dict[str, float] = field(default_factory=dict)
+
+    def record(self, service: str, seconds: float):
+        self.calls[service] = self.calls.get(service, 0) + 1
+        self.seconds[service] = self.seconds.get(service, 0.0) + seconds
+
+
+# Shared by the tasks a request spawns (asyncio.gather copies the context,
+# and the stats object itself is mutated), so concurrent calls are counted.
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def _service(url: httpx.URL) -> str:
+    segment = url.path.lstrip("/").split("/", 1)[0]
+    return UPSTREAM_SERVICES.get(segment, "other")
+
+
+async def _on_request(request: httpx.Request):
+    request.extensions["metrics_start"] = time.perf_counter()
+
+
+async def _on_response(response: httpx.Response):
+    start = response.request.extensions.get("metrics_start")
+    if start is None:
+        return
+    seconds = time.perf_counter() - start
+    service = _service(response.request.url)
+    UPSTREAM_DURATION.observe(seconds, service)
+    length = response.headers.get("content-length")
+    if length and length.isdigit():
+        UPSTREAM_RESPONSE_SIZE.observe(int(length), service)
+    stats = _current.get()
+    if stats is not None:
+        stats.record(service, seconds)
+
+
+# Passed to the pooled client in supabase_client.open_supabase
+HTTPX_EVENT_HOOKS = {"request": [_on_request], "response": [_on_response]}
+
+
+# id(route) -> full path template, for routes included under a prefix
+_route_templates: dict[int, str] = {}
+
+
+def register_router(router, prefix: str):
+    """Record the full template of each route `router` is included with.
+
+    scope["route"] is the route as declared on its APIRouter, whose path
+    lacks the include prefix ("" for the settings root, "/posts" for the
+    blog list), so labels look the prefixed template up here.
+    """
+    for route in router.routes:
+        _route_templates[id(route)] = prefix + route.path
+
+
+def _route_label(scope) -> str:
+    """Full template of the matched route, e.g. /api/blog/posts/{slug}, or
+    "unmatched" when no route matched (404s)."""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    return _route_templates.get(id(route)) or route.path or "/"
+
+
+def _server_timing(total: float, stats: RequestStats) -> str:
+    parts = [f"app;dur={total * 1000:.1f}"]
+    for service in sorted(stats.calls):
+        parts.append(
+            f'{service};dur={stats.seconds[service] * 1000:.1f};desc="{stats.calls[service]} calls"'
+        )
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """Time each request, count its upstream calls and report both.
+
+    Adds a Server-Timing header (app time plus time spent in each Supabase
+    service) and feeds the histograms served at /metrics. Requests are
+    labelled by route template, so /posts/{slug} is one series.
+    """
+
+    def __init__(self, app, exclude: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.exclude = exclude
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def timed_send(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                timing = _server_timing(time.perf_counter() - start, stats)
+                headers.append((b"server-timing", timing.encode()))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            _current.reset(token)
+            label = _route_label(scope)
+            method = scope["method"]
+            REQUEST_DURATION.observe(time.perf_counter() - start, method, label, str(status))
+            RESPONSE_SIZE.observe(size, method, label)
+            REQUEST_UPSTREAM_CALLS.observe(sum(stats.calls.values()), method, label)
+
+
+def render_metrics() -> str:
+    """All histograms in the Prometheus text exposition format."""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
@@ -18,13 +18,20 @@ class TagResponse(TagBase):
     id: UUID
 
 
+class TocEntry(BaseModel):
+    level: int
+    text: str
+    id: str
+
+
 class BlogPostCreate(BaseModel):
     title: str
     slug: str
     excerpt: Optional[str] = None
     content: dict  # TipTap JSON document
-    content_html: Optional[str] = None
+    content_html: Optional[str] = None  # ignored; rendered server-side on save
     cover_image_url: Optional[str] = None
+    cover_image_srcset: Optional[dict[str, str]] = None
     status: str = "draft"
     meta_title: Optional[str] = None
     meta_description: Optional[str] = None
@@ -36,8 +43,9 @@ class BlogPostUpdate(BaseModel):
     slug: Optional[str] = None
     excerpt: Optional[str] = None
     content: Optional[dict] = None
-    content_html: Optional[str] = None
+    content_html: Optional[str] = None  # ignored; rendered server-side on save
     cover_image_url: Optional[str] = None
+    cover_image_srcset: Optional[dict[str, str]] = None
     status: Optional[str] = None
     meta_title: Optional[str] = None
     meta_description: Optional[str] = None
@@ -49,12 +57,17 @@ class BlogPostResponse(BaseModel):
     title: str
     slug: str
     excerpt: Optional[str] = None
+    excerpt_auto: bool = False  # derived from the content, not written by the author
     content: Optional[dict] = None
     content_html: Optional[str] = None
     cover_image_url: Optional[str] = None
+    cover_image_srcset: Optional[dict[str, str]] = None
     status: str
     author_id: Optional[UUID] = None
     published_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
+    word_count: Optional[int] = None
+    reading_time_minutes: Optional[int] = None
+    toc: list[TocEntry] = []
     tags: list[TagResponse] = []
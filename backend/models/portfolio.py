@@ -14,6 +14,7 @@ class PortfolioItemCreate(BaseModel):
     sort_order: int = 0
     width: Optional[int] = None
     height: Optional[int] = None
+    media_srcset: Optional[dict[str, str]] = None
     is_featured: bool = False
 
 
@@ -27,6 +28,7 @@ class PortfolioItemUpdate(BaseModel):
     sort_order: Optional[int] = None
     width: Optional[int] = None
     height: Optional[int] = None
+    media_srcset: Optional[dict[str, str]] = None
     is_featured: Optional[bool] = None
 
 
@@ -41,6 +43,7 @@ class PortfolioItemResponse(BaseModel):
     sort_order: int
     width: Optional[int] = None
     height: Optional[int] = None
+    media_srcset: Optional[dict[str, str]] = None
     is_featured: bool
     created_at: datetime
     updated_at: datetime
@@ -48,3 +51,13 @@ class PortfolioItemResponse(BaseModel):
 
 class ReorderRequest(BaseModel):
     sort_order: int
+
+
+class BulkReorderRequest(BaseModel):
+    item_ids: list[UUID]  # every item, in display order
+
+
+class MoveItemRequest(BaseModel):
+    # The item's new neighbours in display order; give one or both
+    after_id: Optional[UUID] = None
+    before_id: Optional[UUID] = None
@@ -7,7 +7,7 @@ class ExperienceCreate(BaseModel):
     slug: str
     subtitle: Optional[str] = None
     description: Optional[dict] = None
-    description_html: Optional[str] = None
+    description_html: Optional[str] = None  # ignored; rendered server-side on save
     header_image_url: Optional[str] = None
     sort_order: Optional[int] = 0
     is_active: Optional[bool] = True
@@ -18,7 +18,7 @@ class ExperienceUpdate(BaseModel):
     slug: Optional[str] = None
     subtitle: Optional[str] = None
     description: Optional[dict] = None
-    description_html: Optional[str] = None
+    description_html: Optional[str] = None  # ignored; rendered server-side on save
     header_image_url: Optional[str] = None
     sort_order: Optional[int] = None
     is_active: Optional[bool] = None
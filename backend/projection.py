@@ -0,0 +1,26 @@
+from typing import Optional
+from fastapi import HTTPException
+
+
+def parse_fields(
+    fields: Optional[str],
+    allowed: tuple[str, ...],
+    required: tuple[str, ...] = ("id", "updated_at"),
+) -> tuple[str, ...]:
+    """Resolve a comma-separated `fields=` parameter to the columns to select.
+
+    Without `fields` the endpoint's whole projection (`allowed`) is used.
+    Columns in `required` are always included, since ETags and cursors are
+    built from them. The result keeps `allowed`'s order so equivalent
+    requests share a cache entry.
+    """
+    if not fields:
+        return allowed
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    requested.update(required)
+    return tuple(f for f in allowed if f in requested)
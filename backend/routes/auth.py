@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException
 import httpx
 from config import settings
+from auth import get_current_user
+from supabase_client import get_http_client
 from models.auth import LoginRequest, TokenResponse, RefreshRequest
 
 router = APIRouter()
@@ -10,16 +13,41 @@ AUTH_HEADERS = {
     "apikey": settings.supabase_service_role_key,
     "Content-Type": "application/json",
 }
+AUTH_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+AUTH_RETRIES = 3
+AUTH_BACKOFF_SECONDS = 0.2
+
+
+async def _token_request(grant_type: str, payload: dict) -> httpx.Response:
+    """POST to the Supabase token endpoint over the shared pooled client.
+
+    Timeouts, dropped connections and 5xx responses are retried with
+    exponential backoff; any other response is returned to the caller.
+    """
+    client = get_http_client()
+    for attempt in range(AUTH_RETRIES):
+        if attempt:
+            await asyncio.sleep(AUTH_BACKOFF_SECONDS * 2 ** (attempt - 1))
+        try:
+            resp = await client.post(
+                f"{AUTH_URL}/token",
+                params={"grant_type": grant_type},
+                json=payload,
+                headers=AUTH_HEADERS,
+                timeout=AUTH_TIMEOUT,
+            )
+        except httpx.TransportError:
+            continue
+        if resp.status_code < 500:
+            return resp
+    raise HTTPException(status_code=503, detail="Auth service unavailable")
 
 
 @router.post("/login", response_model=TokenResponse)
 async def login(body: LoginRequest):
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{AUTH_URL}/token?grant_type=password",
-            json={"email": body.email, "password": body.password},
-            headers=AUTH_HEADERS,
-        )
+    resp = await _token_request(
+        "password", {"email": body.email, "password": body.password}
+    )
     if resp.status_code != 200:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     data = resp.json()
@@ -31,12 +59,7 @@ async def login(body: LoginRequest):
 
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(body: RefreshRequest):
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{AUTH_URL}/token?grant_type=refresh_token",
-            json={"refresh_token": body.refresh_token},
-            headers=AUTH_HEADERS,
-        )
+    resp = await _token_request("refresh_token", {"refresh_token": body.refresh_token})
     if resp.status_code != 200:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
     data = resp.json()
@@ -47,23 +70,5 @@ async def refresh_token(body: RefreshRequest):
 
 
 @router.get("/me")
-async def get_me(authorization: str = None):
-    from auth import get_current_user
-    from fastapi import Header
-
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    try:
-        from jose import jwt
-        from config import settings
-
-        token = authorization.replace("Bearer ", "")
-        payload = jwt.decode(
-            token,
-            settings.supabase_jwt_secret,
-            algorithms=["HS256"],
-            audience="authenticated",
-        )
-        return {"user": payload}
-    except Exception:
-        raise HTTPException(status_code=401, detail="Invalid token")
+async def get_me(user=Depends(get_current_user)):
+    return {"user": user}
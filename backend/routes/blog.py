@@ -1,9 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Optional
+import asyncio
+import base64
+import json
+from collections import Counter
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Literal, Optional
 from uuid import UUID
 from datetime import datetime, timezone
+from postgrest.exceptions import APIError
 from supabase_client import supabase
 from auth import get_current_user
+from cache import cached
+from change_feed import change_feed
+from config import settings
+from http_cache import CACHE_DETAIL, CACHE_LIST, conditional_response
+from projection import parse_fields
+from search_index import SearchIndex, snippet
+from tiptap import document_stats, render_html
 from models.blog import (
     BlogPostCreate,
     BlogPostUpdate,
@@ -15,196 +27,583 @@ from models.blog import (
 router = APIRouter()
 
 
-def _get_post_tags(post_id: str) -> list[dict]:
-    """Fetch tags for a given post."""
-    result = (
+# Posts are selected with their tags embedded so a whole page of posts costs
+# a single round trip instead of one extra query per post.
+TAGS_EMBED = "blog_post_tags(blog_tags(id, name, slug))"
+
+# Everything a post card needs. List views never select `content` or
+# `content_html`, so post bodies stay in Postgres until a post is opened.
+POST_LIST_COLUMNS = (
+    "id",
+    "title",
+    "slug",
+    "excerpt",
+    "cover_image_url",
+    "cover_image_srcset",
+    "status",
+    "author_id",
+    "published_at",
+    "created_at",
+    "updated_at",
+    "meta_title",
+    "meta_description",
+    "word_count",
+    "reading_time_minutes",
+)
+POST_LIST_FIELDS = POST_LIST_COLUMNS + ("tags",)
+POST_LIST_SELECT = f"{', '.join(POST_LIST_COLUMNS)}, {TAGS_EMBED}"
+
+# A whole post. The search columns (content_text, search_vector) stay out.
+POST_COLUMNS = POST_LIST_COLUMNS + ("content", "content_html", "toc", "excerpt_auto")
+POST_SELECT = f"{', '.join(POST_COLUMNS)}, {TAGS_EMBED}"
+
+MAX_FILTER_TAGS = 5
+
+SEARCH_COLUMNS = (
+    "id",
+    "title",
+    "slug",
+    "excerpt",
+    "cover_image_url",
+    "published_at",
+    "updated_at",
+    "reading_time_minutes",
+)
+
+
+def _post_list_select(columns: tuple[str, ...]) -> str:
+    """Select clause for a post list projection; `tags` maps to the embed."""
+    parts = [c for c in columns if c != "tags"]
+    if "tags" in columns:
+        parts.append(TAGS_EMBED)
+    return ", ".join(parts)
+
+
+def _tag_filter_select(slug_count: int, match_all: bool) -> tuple[str, list[str]]:
+    """Inner-join embeds that restrict posts to the requested tags.
+
+    "Any" matching needs one inner join filtered with `in`; "all" matching
+    needs one aliased inner join per slug, each filtered with `eq`. Returns
+    the extra select clause and the aliases to strip from the result rows.
+    """
+    aliases = [f"tag_filter_{i}" for i in range(slug_count if match_all else 1)]
+    clause = ", ".join(f"{a}:blog_post_tags!inner(blog_tags!inner(slug))" for a in aliases)
+    return clause, aliases
+
+
+async def _get_tags_for_posts(post_ids: list[str]) -> dict[str, list[dict]]:
+    """Fetch tags for many posts in one query, grouped by post id."""
+    tags_by_post: dict[str, list[dict]] = {pid: [] for pid in post_ids}
+    if not post_ids:
+        return tags_by_post
+    result = await (
         supabase.table("blog_post_tags")
-        .select("tag_id, blog_tags(id, name, slug)")
-        .eq("post_id", post_id)
+        .select("post_id, blog_tags(id, name, slug)")
+        .in_("post_id", post_ids)
         .execute()
     )
-    return [row["blog_tags"] for row in result.data if row.get("blog_tags")]
+    for row in result.data:
+        if row.get("blog_tags"):
+            tags_by_post.setdefault(row["post_id"], []).append(row["blog_tags"])
+    return tags_by_post
+
+
+async def _save_post(
+    post_id: Optional[str], changes: dict, tag_ids: Optional[list[UUID]] = None
+) -> dict:
+    """Apply `changes` to a post (or create one if `post_id` is None) and, if
+    given, set its tags to `tag_ids`.
+
+    save_blog_post (supabase_schema.sql) does the write, a diff-based tag
+    sync and the read-back in one transaction, so this is one round trip.
+    Returns the post with a flat `tags` list.
+    """
+    try:
+        result = await supabase.rpc(
+            "save_blog_post",
+            {
+                "target_post_id": post_id,
+                "changes": changes,
+                "tag_ids": None if tag_ids is None else [str(tid) for tid in tag_ids],
+            },
+        ).execute()
+    except APIError as exc:
+        if exc.code == "P0002":  # no_data_found
+            raise HTTPException(status_code=404, detail="Post not found")
+        if exc.code == "23503":  # foreign_key_violation
+            raise HTTPException(status_code=400, detail="Unknown tag")
+        if exc.code == "23505":  # unique_violation
+            raise HTTPException(status_code=409, detail="A post with this slug already exists")
+        raise
+    return result.data
 
 
-def _sync_post_tags(post_id: str, tag_ids: list[UUID]):
-    """Replace all tags for a post."""
-    supabase.table("blog_post_tags").delete().eq("post_id", post_id).execute()
-    if tag_ids:
-        rows = [{"post_id": post_id, "tag_id": str(tid)} for tid in tag_ids]
-        supabase.table("blog_post_tags").insert(rows).execute()
+def _document_columns(content: dict) -> dict:
+    """Columns derived from a post's TipTap content, stored alongside it.
 
+    `content_html` is always rendered here rather than taken from the
+    client. The derived excerpt goes out as `derived_excerpt`, which
+    save_blog_post uses only while the post's excerpt is blank or still an
+    earlier derived one (`excerpt_auto`), never over one the author wrote.
+    """
+    stats = document_stats(content)
+    stats["derived_excerpt"] = stats.pop("excerpt")
+    stats["content_html"] = render_html(content)
+    return stats
 
-def _enrich_post(post: dict) -> dict:
-    """Add tags to a post dict."""
-    post["tags"] = _get_post_tags(post["id"])
-    return post
 
+async def _enrich_posts(posts: list[dict]) -> list[dict]:
+    """Add a flat `tags` list to each post dict.
 
-# --- Public endpoints ---
+    Posts selected with POST_SELECT already carry their tags embedded; any
+    others (e.g. rows returned from an insert or update) are batch-loaded
+    with a single query.
+    """
+    missing = []
+    for post in posts:
+        embedded = post.pop("blog_post_tags", None)
+        if embedded is None:
+            missing.append(post["id"])
+        else:
+            post["tags"] = [row["blog_tags"] for row in embedded if row.get("blog_tags")]
 
+    if missing:
+        tags_by_post = await _get_tags_for_posts(missing)
+        for post in posts:
+            if "tags" not in post:
+                post["tags"] = tags_by_post.get(post["id"], [])
+    return posts
 
-@router.get("/posts")
-async def list_published_posts(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(10, ge=1, le=50),
-    tag: Optional[str] = None,
-):
-    offset = (page - 1) * per_page
-
-    if tag:
-        # Filter by tag slug
-        tag_result = supabase.table("blog_tags").select("id").eq("slug", tag).execute()
-        if not tag_result.data:
-            return {"posts": [], "total": 0, "page": page, "per_page": per_page}
-
-        tag_id = tag_result.data[0]["id"]
-        post_ids_result = (
-            supabase.table("blog_post_tags")
-            .select("post_id")
-            .eq("tag_id", tag_id)
-            .execute()
-        )
-        post_ids = [row["post_id"] for row in post_ids_result.data]
 
-        if not post_ids:
-            return {"posts": [], "total": 0, "page": page, "per_page": per_page}
+async def _enrich_post(post: dict) -> dict:
+    """Add tags to a single post dict."""
+    return (await _enrich_posts([post]))[0]
 
-        result = (
-            supabase.table("blog_posts")
-            .select("*", count="exact")
-            .eq("status", "published")
-            .in_("id", post_ids)
-            .order("published_at", desc=True)
-            .range(offset, offset + per_page - 1)
+
+# --- Public endpoints ---
+
+
+def _encode_cursor(post: dict, direction: str) -> str:
+    """Opaque keyset cursor pointing just past `post` in the given direction."""
+    raw = json.dumps([direction, post.get("published_at"), post["id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, Optional[str], str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, published_at, post_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(post_id, str) or not isinstance(published_at, (str, type(None))):
+            raise ValueError("cursor fields must be strings")
+        if published_at is not None:
+            datetime.fromisoformat(published_at)
+        UUID(post_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if direction not in ("next", "prev"):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return direction, published_at, post_id
+
+
+def _keyset_filter(forward: bool, published_at: Optional[str], post_id: str) -> str:
+    """or= filter for rows after (forward) or before a cursor position.
+
+    Posts are ordered by published_at DESC NULLS LAST, id DESC, so an
+    undated post (published before publishing set the date) still has a
+    place in the walk instead of ending it.
+    """
+    op = "lt" if forward else "gt"
+    if published_at is None:
+        if forward:
+            return f"and(published_at.is.null,id.lt.{post_id})"
+        return f"published_at.not.is.null,and(published_at.is.null,id.gt.{post_id})"
+    terms = [
+        f'published_at.{op}."{published_at}"',
+        f'and(published_at.eq."{published_at}",id.{op}.{post_id})',
+    ]
+    if forward:
+        terms.append("published_at.is.null")
+    return ",".join(terms)
+
+
+@cached("blog_posts")
+async def _load_post_page(
+    columns: tuple[str, ...],
+    slugs: tuple[str, ...],
+    tag_match: str,
+    cursor: Optional[tuple[str, Optional[str], str]],
+    page: int,
+    per_page: int,
+    count: Optional[str],
+) -> dict:
+    """One page of published post cards; see list_published_posts."""
+    # Tag filters are inner-join embeds, so filtering happens in the same
+    # query and its cost scales with the page size, not the tag's post count.
+    select = _post_list_select(columns)
+    filter_aliases: list[str] = []
+    if slugs:
+        clause, filter_aliases = _tag_filter_select(len(slugs), tag_match == "all")
+        select = f"{select}, {clause}"
+
+    query = (
+        supabase.table("blog_posts")
+        .select(select, count=count)
+        .eq("status", "published")
+    )
+    if slugs and tag_match == "all":
+        for alias, slug in zip(filter_aliases, slugs):
+            query = query.eq(f"{alias}.blog_tags.slug", slug)
+    elif slugs:
+        query = query.in_(f"{filter_aliases[0]}.blog_tags.slug", slugs)
+
+    if cursor:
+        # Keyset pagination walks idx_blog_posts_status_published instead of
+        # scanning and discarding `offset` rows.
+        direction, published_at, post_id = cursor
+        forward = direction == "next"
+        result = await (
+            query.or_(_keyset_filter(forward, published_at, post_id))
+            .order("published_at", desc=forward, nullsfirst=not forward)
+            .order("id", desc=forward)
+            .limit(per_page + 1)
             .execute()
         )
+        rows = result.data[:per_page]
+        has_more = len(result.data) > per_page
+        if direction == "prev":
+            rows.reverse()
+        has_next = has_more if direction == "next" else bool(rows)
+        has_prev = has_more if direction == "prev" else bool(rows)
     else:
-        result = (
-            supabase.table("blog_posts")
-            .select("*", count="exact")
-            .eq("status", "published")
-            .order("published_at", desc=True)
+        offset = (page - 1) * per_page
+        result = await (
+            query.order("published_at", desc=True, nullsfirst=False)
+            .order("id", desc=True)
             .range(offset, offset + per_page - 1)
             .execute()
         )
-
-    posts = [_enrich_post(p) for p in result.data]
-    # Remove raw content from list view for performance
+        rows = result.data
+        if result.count is not None:
+            has_next = offset + len(rows) < result.count
+        else:
+            has_next = len(rows) == per_page
+        has_prev = page > 1 and bool(rows)
+
+    posts = await _enrich_posts(rows) if "tags" in columns else rows
     for p in posts:
-        p.pop("content", None)
+        for alias in filter_aliases:
+            p.pop(alias, None)
 
     return {
         "posts": posts,
-        "total": result.count or 0,
-        "page": page,
+        "total": (result.count or 0) if count else None,
+        "page": None if cursor else page,
         "per_page": per_page,
+        "next_cursor": _encode_cursor(posts[-1], "next") if has_next else None,
+        "prev_cursor": _encode_cursor(posts[0], "prev") if has_prev else None,
     }
 
 
-@router.get("/posts/{slug}")
-async def get_published_post(slug: str):
-    result = (
+@router.get("/posts")
+async def list_published_posts(
+    request: Request,
+    page: int = Query(1, ge=1),
+    per_page: int = Query(10, ge=1, le=50),
+    tag: Optional[str] = None,
+    tags: Optional[list[str]] = Query(None),
+    tag_match: Literal["any", "all"] = "any",
+    cursor: Optional[str] = None,
+    count: Optional[Literal["exact", "planned", "estimated"]] = None,
+    fields: Optional[str] = None,
+):
+    """List published posts, newest first.
+
+    Pass `cursor` (a `next_cursor`/`prev_cursor` from a previous response)
+    for keyset pagination on (published_at, id); otherwise `page` is used as
+    an offset. `tag` and/or repeated `tags` filter by tag slug, matching
+    posts with any (default) or all of them. `count` controls whether a
+    total is computed: page mode defaults to an exact count, cursor mode
+    skips it unless asked.
+    `fields` is a comma-separated subset of the card fields to return
+    (`id`, `published_at` and `updated_at` are always included).
+    """
+    if count is None and cursor is None:
+        count = "exact"
+    slugs = tuple(dict.fromkeys(([tag] if tag else []) + (tags or [])))
+    if len(slugs) > MAX_FILTER_TAGS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_FILTER_TAGS} tags can be combined"
+        )
+    columns = parse_fields(fields, POST_LIST_FIELDS, ("id", "published_at", "updated_at"))
+    payload = await _load_post_page(
+        columns, slugs, tag_match, _decode_cursor(cursor) if cursor else None, page, per_page, count
+    )
+    return conditional_response(request, payload, CACHE_LIST)
+
+
+def _encode_search_cursor(rank: float, post_id: str) -> str:
+    raw = json.dumps([rank, post_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_search_cursor(cursor: str) -> tuple[float, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, post_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(post_id, str) or not isinstance(rank, (int, float)):
+            raise ValueError("cursor fields have the wrong types")
+        UUID(post_id)
+        return float(rank), post_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def _search_postgres(
+    q: str, slugs: list[str], after: Optional[tuple[float, str]], limit: int, with_facets: bool
+) -> tuple[list[dict], int, Optional[list[dict]]]:
+    """Run the search_blog_posts (and facet) functions; see supabase_schema.sql."""
+    params = {
+        "search_query": q,
+        "tag_slugs": slugs or None,
+        "after_rank": after[0] if after else None,
+        "after_id": after[1] if after else None,
+        "max_results": limit,
+    }
+    calls = [supabase.rpc("search_blog_posts", params).execute()]
+    if with_facets:
+        calls.append(
+            supabase.rpc(
+                "search_blog_tag_facets", {"search_query": q, "tag_slugs": slugs or None}
+            ).execute()
+        )
+    results = await asyncio.gather(*calls)
+
+    rows = results[0].data
+    total = rows[0]["total_matches"] if rows else 0
+    for row in rows:
+        row.pop("total_matches", None)
+    facets = None
+    if with_facets:
+        facets = [
+            {"slug": f["slug"], "name": f["name"], "count": f["post_count"]}
+            for f in results[1].data
+        ]
+    return await _enrich_posts(rows), total, facets
+
+
+@cached("blog_posts")
+async def _load_search_index() -> SearchIndex:
+    result = await (
         supabase.table("blog_posts")
-        .select("*")
-        .eq("slug", slug)
+        .select(f"{', '.join(SEARCH_COLUMNS)}, content_text, {TAGS_EMBED}")
         .eq("status", "published")
         .execute()
     )
-    if not result.data:
+    return SearchIndex(await _enrich_posts(result.data))
+
+
+async def _search_memory(
+    q: str, slugs: list[str], after: Optional[tuple[float, str]], limit: int, with_facets: bool
+) -> tuple[list[dict], int, Optional[list[dict]]]:
+    ranked = (await _load_search_index()).search(q, slugs)
+    page = [(rank, post) for rank, post in ranked if after is None or (rank, post["id"]) < after]
+    rows = [
+        {
+            **{col: post.get(col) for col in SEARCH_COLUMNS},
+            "tags": post["tags"],
+            "rank": rank,
+            "snippet": snippet(post.get("content_text") or "", q),
+        }
+        for rank, post in page[:limit]
+    ]
+    facets = None
+    if with_facets:
+        counts = Counter()
+        names = {}
+        for _, post in ranked:
+            for tag in post["tags"]:
+                counts[tag["slug"]] += 1
+                names[tag["slug"]] = tag["name"]
+        facets = [
+            {"slug": slug, "name": names[slug], "count": n}
+            for slug, n in sorted(counts.items(), key=lambda item: (-item[1], names[item[0]]))
+        ]
+    return rows, len(ranked), facets
+
+
+@router.get("/search")
+async def search_posts(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    tags: Optional[list[str]] = Query(None),
+    per_page: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = None,
+):
+    """Full-text search over published posts, best match first.
+
+    `q` accepts web-search syntax (quoted phrases, `or`, `-term`). Each
+    result carries its `rank` and a highlighted `snippet`; the first page
+    also returns tag `facets` for the matches. Pass `next_cursor` back as
+    `cursor` for the next page.
+    """
+    slugs = list(dict.fromkeys(tags or []))
+    if len(slugs) > MAX_FILTER_TAGS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_FILTER_TAGS} tags can be combined"
+        )
+    after = _decode_search_cursor(cursor) if cursor else None
+
+    search = _search_memory if settings.search_backend == "memory" else _search_postgres
+    rows, total, facets = await search(q, slugs, after, per_page + 1, cursor is None)
+
+    results = rows[:per_page]
+    has_more = len(rows) > per_page
+    payload = {
+        "results": results,
+        "total": total,
+        "facets": facets,
+        "per_page": per_page,
+        "next_cursor": (
+            _encode_search_cursor(results[-1]["rank"], results[-1]["id"]) if has_more else None
+        ),
+    }
+    return conditional_response(request, payload, CACHE_LIST)
+
+
+async def _load_published_posts(slugs: list[str]) -> list[dict]:
+    """Whole published posts for the given slugs, ready to serve."""
+    result = await (
+        supabase.table("blog_posts")
+        .select(POST_SELECT)
+        .in_("slug", slugs)
+        .eq("status", "published")
+        .execute()
+    )
+    posts = await _enrich_posts(result.data)
+    for post in posts:
+        if not post.get("content_html"):
+            # Posts saved before server-side rendering
+            post["content_html"] = render_html(post.get("content"))
+    return posts
+
+
+@cached("blog_posts")
+async def _load_post(slug: str) -> Optional[dict]:
+    posts = await _load_published_posts([slug])
+    return posts[0] if posts else None
+
+
+@router.get("/posts/{slug}")
+async def get_published_post(request: Request, slug: str):
+    post = await _load_post(slug)
+    if post is None:
         raise HTTPException(status_code=404, detail="Post not found")
-    return _enrich_post(result.data[0])
+    return conditional_response(request, post, CACHE_DETAIL)
 
 
-@router.get("/tags")
-async def list_tags():
-    result = supabase.table("blog_tags").select("*").order("name").execute()
+@cached("blog_posts")
+async def _load_latest_posts(limit: int) -> list[dict]:
+    """The newest published posts as cards, for the bootstrap document."""
+    result = await (
+        supabase.table("blog_posts")
+        .select(POST_LIST_SELECT)
+        .eq("status", "published")
+        .order("published_at", desc=True, nullsfirst=False)
+        .order("id", desc=True)
+        .limit(limit)
+        .execute()
+    )
+    return await _enrich_posts(result.data)
+
+
+@cached("blog_tags")
+async def _load_tags() -> list[dict]:
+    result = await supabase.table("blog_tags").select("*").order("name").execute()
     return result.data
 
 
+@router.get("/tags")
+async def list_tags(request: Request):
+    return conditional_response(request, await _load_tags(), CACHE_LIST)
+
+
 # --- Admin endpoints ---
 
 
 @router.get("/admin/posts")
 async def admin_list_posts(user=Depends(get_current_user)):
-    result = (
+    result = await (
         supabase.table("blog_posts")
-        .select("*")
+        .select(POST_LIST_SELECT)
         .order("updated_at", desc=True)
         .execute()
     )
-    return [_enrich_post(p) for p in result.data]
+    return await _enrich_posts(result.data)
 
 
 @router.get("/admin/posts/{post_id}")
 async def admin_get_post(post_id: UUID, user=Depends(get_current_user)):
-    result = (
-        supabase.table("blog_posts").select("*").eq("id", str(post_id)).execute()
+    result = await (
+        supabase.table("blog_posts")
+        .select(POST_SELECT)
+        .eq("id", str(post_id))
+        .execute()
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Post not found")
-    return _enrich_post(result.data[0])
+    return await _enrich_post(result.data[0])
 
 
 @router.post("/admin/posts")
 async def create_post(body: BlogPostCreate, user=Depends(get_current_user)):
-    post_data = body.model_dump(exclude={"tag_ids"})
+    post_data = body.model_dump(exclude={"tag_ids", "content_html"})
     post_data["author_id"] = user.get("sub")
+    post_data.update(_document_columns(body.content))
     if post_data["status"] == "published":
         post_data["published_at"] = datetime.now(timezone.utc).isoformat()
 
-    result = supabase.table("blog_posts").insert(post_data).execute()
-    if not result.data:
-        raise HTTPException(status_code=500, detail="Failed to create post")
-
-    post = result.data[0]
-    if body.tag_ids:
-        _sync_post_tags(post["id"], body.tag_ids)
-
-    return _enrich_post(post)
+    post = await _save_post(None, post_data, body.tag_ids)
+    change_feed.wrote("blog_posts", [post])
+    change_feed.wrote("blog_post_tags", ids=[post["id"]])
+    return post
 
 
 @router.put("/admin/posts/{post_id}")
 async def update_post(
     post_id: UUID, body: BlogPostUpdate, user=Depends(get_current_user)
 ):
-    update_data = body.model_dump(exclude_none=True, exclude={"tag_ids"})
+    update_data = body.model_dump(exclude_none=True, exclude={"tag_ids", "content_html"})
     if not update_data and body.tag_ids is None:
         raise HTTPException(status_code=400, detail="No fields to update")
-
-    if update_data:
-        result = (
-            supabase.table("blog_posts")
-            .update(update_data)
-            .eq("id", str(post_id))
-            .execute()
-        )
-        if not result.data:
-            raise HTTPException(status_code=404, detail="Post not found")
-
+    if body.content is not None:
+        update_data.update(_document_columns(body.content))
+    if update_data.get("status") == "published":
+        # save_blog_post keeps the date of a post that was already published
+        update_data["published_at"] = datetime.now(timezone.utc).isoformat()
+
+    post = await _save_post(str(post_id), update_data, body.tag_ids)
+    change_feed.wrote("blog_posts", [post])
     if body.tag_ids is not None:
-        _sync_post_tags(str(post_id), body.tag_ids)
-
-    # Return updated post
-    result = (
-        supabase.table("blog_posts").select("*").eq("id", str(post_id)).execute()
-    )
-    return _enrich_post(result.data[0])
+        change_feed.wrote("blog_post_tags", ids=[post["id"]])
+    return post
 
 
 @router.delete("/admin/posts/{post_id}")
 async def delete_post(post_id: UUID, user=Depends(get_current_user)):
-    supabase.table("blog_post_tags").delete().eq("post_id", str(post_id)).execute()
-    result = (
+    result = await (
         supabase.table("blog_posts").delete().eq("id", str(post_id)).execute()
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Post not found")
+    # Its tag and featured rows go with it (ON DELETE CASCADE)
+    for table in ("blog_posts", "blog_post_tags", "work_featured_posts"):
+        change_feed.wrote(table, ids=[str(post_id)])
     return {"message": "Post deleted"}
 
 
 @router.patch("/admin/posts/{post_id}/publish")
 async def publish_post(post_id: UUID, user=Depends(get_current_user)):
-    result = (
+    result = await (
         supabase.table("blog_posts")
         .update(
             {
@@ -213,44 +612,50 @@ async def publish_post(post_id: UUID, user=Depends(get_current_user)):
             }
         )
         .eq("id", str(post_id))
+        .select(POST_SELECT)
         .execute()
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Post not found")
-    return _enrich_post(result.data[0])
+    change_feed.wrote("blog_posts", result.data)
+    return await _enrich_post(result.data[0])
 
 
 @router.patch("/admin/posts/{post_id}/unpublish")
 async def unpublish_post(post_id: UUID, user=Depends(get_current_user)):
-    result = (
+    result = await (
         supabase.table("blog_posts")
         .update({"status": "draft", "published_at": None})
         .eq("id", str(post_id))
+        .select(POST_SELECT)
         .execute()
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Post not found")
-    return _enrich_post(result.data[0])
+    change_feed.wrote("blog_posts", result.data)
+    return await _enrich_post(result.data[0])
 
 
 @router.post("/admin/tags")
 async def create_tag(body: TagCreate, user=Depends(get_current_user)):
-    result = (
+    result = await (
         supabase.table("blog_tags")
         .insert({"name": body.name, "slug": body.slug})
         .execute()
     )
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to create tag")
+    change_feed.wrote("blog_tags", result.data)
     return result.data[0]
 
 
 @router.delete("/admin/tags/{tag_id}")
 async def delete_tag(tag_id: UUID, user=Depends(get_current_user)):
-    supabase.table("blog_post_tags").delete().eq("tag_id", str(tag_id)).execute()
-    result = (
+    result = await (
         supabase.table("blog_tags").delete().eq("id", str(tag_id)).execute()
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Tag not found")
+    for table in ("blog_tags", "blog_post_tags"):
+        change_feed.wrote(table, ids=[str(tag_id)])
     return {"message": "Tag deleted"}
@@ -0,0 +1,40 @@
+import asyncio
+from fastapi import APIRouter, Request
+from http_cache import CACHE_LIST, conditional_response
+from routes.blog import _load_latest_posts
+from routes.influences import INFLUENCE_LIST_COLUMNS, _load_influences
+from routes.portfolio import PORTFOLIO_LIST_COLUMNS, _load_items
+from routes.settings import _load_settings
+from routes.work import EXPERIENCE_LIST_COLUMNS, _load_experiences
+
+router = APIRouter()
+
+LATEST_POSTS = 10
+
+
+async def _load_bootstrap() -> dict:
+    """Everything the landing page needs.
+
+    The sections come from the same cached loaders as their own endpoints
+    and are fetched concurrently.
+    """
+    settings, posts, portfolio, experiences, influences = await asyncio.gather(
+        _load_settings(),
+        _load_latest_posts(LATEST_POSTS),
+        _load_items(None, None, True, PORTFOLIO_LIST_COLUMNS),
+        _load_experiences(EXPERIENCE_LIST_COLUMNS),
+        _load_influences(None, INFLUENCE_LIST_COLUMNS),
+    )
+    return {
+        "settings": settings,
+        "posts": posts,
+        "featured_portfolio": portfolio,
+        "experiences": experiences,
+        "influences": influences,
+    }
+
+
+@router.get("")
+async def get_bootstrap(request: Request):
+    """The landing page's data in one response, with an ETag of its own."""
+    return conditional_response(request, await _load_bootstrap(), CACHE_LIST)
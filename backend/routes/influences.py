@@ -1,37 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from uuid import UUID
 from typing import Optional
 from supabase_client import supabase
 from auth import get_current_user
+from cache import cached
+from change_feed import change_feed
+from http_cache import CACHE_LIST, conditional_response
+from projection import parse_fields
 from models.influences import InfluenceCreate, InfluenceUpdate
 
 router = APIRouter()
 
+INFLUENCE_LIST_COLUMNS = (
+    "id",
+    "title",
+    "category",
+    "author",
+    "description",
+    "image_url",
+    "link_url",
+    "sort_order",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
 
 # --- Public endpoints ---
 
 
-@router.get("/")
-async def list_influences(category: Optional[str] = Query(None)):
+@cached("influences")
+async def _load_influences(
+    category: Optional[str], columns: tuple[str, ...] = INFLUENCE_LIST_COLUMNS
+) -> list[dict]:
     query = (
         supabase.table("influences")
-        .select("*")
+        .select(", ".join(columns))
         .eq("is_active", True)
         .order("category")
         .order("sort_order")
     )
     if category:
         query = query.eq("category", category)
-    result = query.execute()
+    result = await query.execute()
     return result.data
 
 
+@router.get("/")
+async def list_influences(
+    request: Request, category: Optional[str] = Query(None), fields: Optional[str] = None
+):
+    columns = parse_fields(fields, INFLUENCE_LIST_COLUMNS)
+    return conditional_response(
+        request, await _load_influences(category, columns), CACHE_LIST
+    )
+
+
 # --- Admin endpoints ---
 
 
 @router.get("/admin/influences")
 async def admin_list_influences(user=Depends(get_current_user)):
-    result = (
+    result = await (
         supabase.table("influences")
         .select("*")
         .order("category")
@@ -45,11 +75,12 @@ async def admin_list_influences(user=Depends(get_current_user)):
 async def create_influence(
     body: InfluenceCreate, user=Depends(get_current_user)
 ):
-    result = (
+    result = await (
         supabase.table("influences").insert(body.model_dump()).execute()
     )
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to create influence")
+    change_feed.wrote("influences", result.data)
     return result.data[0]
 
 
@@ -61,7 +92,7 @@ async def update_influence(
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    result = (
+    result = await (
         supabase.table("influences")
         .update(update_data)
         .eq("id", str(influence_id))
@@ -69,6 +100,7 @@ async def update_influence(
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Influence not found")
+    change_feed.wrote("influences", result.data)
     return result.data[0]
 
 
@@ -76,7 +108,7 @@ async def update_influence(
 async def delete_influence(
     influence_id: UUID, user=Depends(get_current_user)
 ):
-    result = (
+    result = await (
         supabase.table("influences")
         .delete()
         .eq("id", str(influence_id))
@@ -84,4 +116,5 @@ async def delete_influence(
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Influence not found")
+    change_feed.wrote("influences", ids=[str(influence_id)])
     return {"message": "Influence deleted"}
@@ -1,28 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import Optional
 from uuid import UUID
+from postgrest.exceptions import APIError
 from supabase_client import supabase
 from auth import get_current_user
+from cache import cached
+from change_feed import change_feed
+from http_cache import CACHE_DETAIL, CACHE_LIST, conditional_response
+from projection import parse_fields
 from models.portfolio import (
     PortfolioItemCreate,
     PortfolioItemUpdate,
     PortfolioItemResponse,
     ReorderRequest,
+    BulkReorderRequest,
+    MoveItemRequest,
 )
 
 router = APIRouter()
 
+PORTFOLIO_LIST_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "media_type",
+    "media_url",
+    "thumbnail_url",
+    "category",
+    "sort_order",
+    "width",
+    "height",
+    "media_srcset",
+    "is_featured",
+    "created_at",
+    "updated_at",
+)
+
 
 # --- Public endpoints ---
 
 
-@router.get("/items")
-async def list_items(
-    category: Optional[str] = None,
-    media_type: Optional[str] = None,
-    featured_only: bool = False,
-):
-    query = supabase.table("portfolio_items").select("*")
+@cached("portfolio")
+async def _load_items(
+    category: Optional[str],
+    media_type: Optional[str],
+    featured_only: bool,
+    columns: tuple[str, ...] = PORTFOLIO_LIST_COLUMNS,
+) -> list[dict]:
+    query = supabase.table("portfolio_items").select(", ".join(columns))
 
     if category:
         query = query.eq("category", category)
@@ -31,26 +56,44 @@ async def list_items(
     if featured_only:
         query = query.eq("is_featured", True)
 
-    result = query.order("sort_order").order("created_at", desc=True).execute()
+    result = await query.order("sort_order").order("created_at", desc=True).execute()
     return result.data
 
 
+@cached("portfolio")
+async def _load_categories() -> list[str]:
+    result = await supabase.table("portfolio_items").select("category").execute()
+    categories = list(set(row["category"] for row in result.data if row.get("category")))
+    categories.sort()
+    return categories
+
+
+@router.get("/items")
+async def list_items(
+    request: Request,
+    category: Optional[str] = None,
+    media_type: Optional[str] = None,
+    featured_only: bool = False,
+    fields: Optional[str] = None,
+):
+    columns = parse_fields(fields, PORTFOLIO_LIST_COLUMNS)
+    items = await _load_items(category, media_type, featured_only, columns)
+    return conditional_response(request, items, CACHE_LIST)
+
+
 @router.get("/items/{item_id}")
-async def get_item(item_id: UUID):
-    result = (
+async def get_item(request: Request, item_id: UUID):
+    result = await (
         supabase.table("portfolio_items").select("*").eq("id", str(item_id)).execute()
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Portfolio item not found")
-    return result.data[0]
+    return conditional_response(request, result.data[0], CACHE_DETAIL)
 
 
 @router.get("/categories")
-async def list_categories():
-    result = supabase.table("portfolio_items").select("category").execute()
-    categories = list(set(row["category"] for row in result.data if row.get("category")))
-    categories.sort()
-    return categories
+async def list_categories(request: Request):
+    return conditional_response(request, await _load_categories(), CACHE_LIST)
 
 
 # --- Admin endpoints ---
@@ -58,14 +101,33 @@ async def list_categories():
 
 @router.post("/admin/items")
 async def create_item(body: PortfolioItemCreate, user=Depends(get_current_user)):
-    result = (
+    result = await (
         supabase.table("portfolio_items").insert(body.model_dump()).execute()
     )
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to create portfolio item")
+    change_feed.wrote("portfolio_items", result.data)
     return result.data[0]
 
 
+# Declared before /admin/items/{item_id} so "order" isn't taken for an id.
+@router.put("/admin/items/order")
+async def set_item_order(body: BulkReorderRequest, user=Depends(get_current_user)):
+    """Reorder the whole gallery in one statement; `item_ids` must list every item."""
+    if len(set(body.item_ids)) != len(body.item_ids):
+        raise HTTPException(status_code=400, detail="Duplicate item ids")
+    try:
+        result = await supabase.rpc(
+            "reorder_portfolio_items", {"item_ids": [str(i) for i in body.item_ids]}
+        ).execute()
+    except APIError as exc:
+        if exc.code == "22023":
+            raise HTTPException(status_code=400, detail=exc.message)
+        raise
+    change_feed.wrote("portfolio_items", result.data)
+    return result.data
+
+
 @router.put("/admin/items/{item_id}")
 async def update_item(
     item_id: UUID, body: PortfolioItemUpdate, user=Depends(get_current_user)
@@ -74,7 +136,7 @@ async def update_item(
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    result = (
+    result = await (
         supabase.table("portfolio_items")
         .update(update_data)
         .eq("id", str(item_id))
@@ -82,21 +144,23 @@ async def update_item(
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Portfolio item not found")
+    change_feed.wrote("portfolio_items", result.data)
     return result.data[0]
 
 
 @router.delete("/admin/items/{item_id}")
 async def delete_item(item_id: UUID, user=Depends(get_current_user)):
     # Get item to find media URL for cleanup
-    item_result = (
+    item_result = await (
         supabase.table("portfolio_items").select("*").eq("id", str(item_id)).execute()
     )
     if not item_result.data:
         raise HTTPException(status_code=404, detail="Portfolio item not found")
 
-    result = (
+    result = await (
         supabase.table("portfolio_items").delete().eq("id", str(item_id)).execute()
     )
+    change_feed.wrote("portfolio_items", ids=[str(item_id)])
     return {"message": "Portfolio item deleted"}
 
 
@@ -104,7 +168,7 @@ async def delete_item(item_id: UUID, user=Depends(get_current_user)):
 async def reorder_item(
     item_id: UUID, body: ReorderRequest, user=Depends(get_current_user)
 ):
-    result = (
+    result = await (
         supabase.table("portfolio_items")
         .update({"sort_order": body.sort_order})
         .eq("id", str(item_id))
@@ -112,4 +176,31 @@ async def reorder_item(
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Portfolio item not found")
+    change_feed.wrote("portfolio_items", result.data)
     return result.data[0]
+
+
+@router.patch("/admin/items/{item_id}/move")
+async def move_item(
+    item_id: UUID, body: MoveItemRequest, user=Depends(get_current_user)
+):
+    """Move one item between two neighbours, usually rewriting only its own row."""
+    if body.after_id is None and body.before_id is None:
+        raise HTTPException(status_code=400, detail="Give after_id or before_id")
+    try:
+        result = await supabase.rpc(
+            "move_portfolio_item",
+            {
+                "item_id": str(item_id),
+                "after_id": str(body.after_id) if body.after_id else None,
+                "before_id": str(body.before_id) if body.before_id else None,
+            },
+        ).execute()
+    except APIError as exc:
+        if exc.code == "P0002":
+            raise HTTPException(status_code=404, detail="Portfolio item not found")
+        if exc.code == "22023":
+            raise HTTPException(status_code=400, detail=exc.message)
+        raise
+    change_feed.wrote("portfolio_items", result.data)
+    return result.data
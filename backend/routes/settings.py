@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional
 from supabase_client import supabase
 from auth import get_current_user
+from cache import cached
+from change_feed import change_feed
+from http_cache import CACHE_SETTINGS, conditional_response
 
 router = APIRouter()
 
@@ -17,21 +20,26 @@ class SiteSettingsUpdate(BaseModel):
     social_linkedin: Optional[str] = None
 
 
-@router.get("")
-async def get_settings():
-    result = supabase.table("site_settings").select("*").eq("id", 1).execute()
+@cached("settings")
+async def _load_settings() -> dict:
+    result = await supabase.table("site_settings").select("*").eq("id", 1).execute()
     if not result.data:
         return {}
     return result.data[0]
 
 
+@router.get("")
+async def get_settings(request: Request):
+    return conditional_response(request, await _load_settings(), CACHE_SETTINGS)
+
+
 @router.put("/admin")
 async def update_settings(body: SiteSettingsUpdate, user=Depends(get_current_user)):
     update_data = body.model_dump(exclude_none=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    result = (
+    result = await (
         supabase.table("site_settings")
         .update(update_data)
         .eq("id", 1)
@@ -40,6 +48,7 @@ async def update_settings(body: SiteSettingsUpdate, user=Depends(get_current_use
     if not result.data:
         # Insert if doesn't exist
         update_data["id"] = 1
-        result = supabase.table("site_settings").insert(update_data).execute()
+        result = await supabase.table("site_settings").insert(update_data).execute()
 
+    change_feed.wrote("site_settings", result.data)
     return result.data[0] if result.data else update_data
@@ -1,15 +1,46 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from uuid import uuid4
 from supabase_client import supabase
 from auth import get_current_user
+from upload_stream import hash_upload, upload_to_storage
+from image_variants import PROCESSABLE_TYPES, create_variants, image_extension
 
 router = APIRouter()
 
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
-ALLOWED_VIDEO_TYPES = {"video/mp4", "video/quicktime", "video/webm"}
+# Video extensions come from the (allow-listed) type; images are sniffed
+VIDEO_EXTENSIONS = {"video/mp4": "mp4", "video/quicktime": "mov", "video/webm": "webm"}
+ALLOWED_VIDEO_TYPES = set(VIDEO_EXTENSIONS)
 MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5MB
 MAX_VIDEO_SIZE = 100 * 1024 * 1024  # 100MB
 
+# Request body limits enforced by BodySizeLimitMiddleware before parsing
+UPLOAD_BODY_LIMITS = {
+    "/blog-image": MAX_IMAGE_SIZE,
+    "/portfolio-media": MAX_VIDEO_SIZE,
+    "/work-image": MAX_IMAGE_SIZE,
+}
+
+
+async def _image_extension(file: UploadFile) -> str:
+    """Storage extension from the image's actual format, not the client's filename."""
+    await file.seek(0)
+    ext = image_extension(file.file)
+    if ext is None:
+        raise HTTPException(status_code=400, detail="Invalid image type")
+    return ext
+
+
+async def _image_manifest(bucket: str, path: str, file: UploadFile, created: bool) -> dict:
+    """Build responsive variants for an uploaded image.
+
+    Returns width/height and a srcset per format, or an empty dict when the
+    file isn't a processable image; the original upload is kept either way.
+    """
+    if file.content_type not in PROCESSABLE_TYPES:
+        return {}
+    await file.seek(0)
+    return await create_variants(bucket, path, await file.read(), existing=not created)
+
 
 @router.post("/blog-image")
 async def upload_blog_image(
@@ -20,19 +51,15 @@ async def upload_blog_image(
     if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(status_code=400, detail="Invalid image type")
 
-    content = await file.read()
-    if len(content) > MAX_IMAGE_SIZE:
-        raise HTTPException(status_code=400, detail="Image too large (max 5MB)")
+    detail = "Image too large (max 5MB)"
+    digest = await hash_upload(file, MAX_IMAGE_SIZE, detail)
+    filename = f"{folder}/{digest}.{await _image_extension(file)}"
 
-    ext = file.filename.split(".")[-1] if file.filename else "jpg"
-    filename = f"{folder}/{uuid4()}.{ext}"
+    created = await upload_to_storage("blog-images", filename, file, MAX_IMAGE_SIZE, detail)
 
-    supabase.storage.from_("blog-images").upload(
-        filename, content, {"content-type": file.content_type}
-    )
-
-    public_url = supabase.storage.from_("blog-images").get_public_url(filename)
-    return {"url": public_url, "path": filename}
+    manifest = await _image_manifest("blog-images", filename, file, created)
+    public_url = await supabase.storage.from_("blog-images").get_public_url(filename)
+    return {"url": public_url, "path": filename, **manifest}
 
 
 @router.post("/portfolio-media")
@@ -44,24 +71,31 @@ async def upload_portfolio_media(
     if file.content_type not in all_allowed:
         raise HTTPException(status_code=400, detail="Invalid file type")
 
-    content = await file.read()
-
     is_video = file.content_type in ALLOWED_VIDEO_TYPES
     max_size = MAX_VIDEO_SIZE if is_video else MAX_IMAGE_SIZE
-    if len(content) > max_size:
-        limit = "100MB" if is_video else "5MB"
-        raise HTTPException(status_code=400, detail=f"File too large (max {limit})")
-
-    ext = file.filename.split(".")[-1] if file.filename else ("mp4" if is_video else "jpg")
+    limit = "100MB" if is_video else "5MB"
+    detail = f"File too large (max {limit})"
+    digest = await hash_upload(file, max_size, detail)
+
+    if is_video:
+        ext = VIDEO_EXTENSIONS[file.content_type]
+    else:
+        ext = await _image_extension(file)
     subfolder = "videos" if is_video else "photos"
-    filename = f"{subfolder}/{uuid4()}.{ext}"
+    filename = f"{subfolder}/{digest}.{ext}"
 
-    supabase.storage.from_("portfolio-media").upload(
-        filename, content, {"content-type": file.content_type}
-    )
+    created = await upload_to_storage("portfolio-media", filename, file, max_size, detail)
 
-    public_url = supabase.storage.from_("portfolio-media").get_public_url(filename)
-    return {"url": public_url, "path": filename, "media_type": "video" if is_video else "photo"}
+    manifest = (
+        {} if is_video else await _image_manifest("portfolio-media", filename, file, created)
+    )
+    public_url = await supabase.storage.from_("portfolio-media").get_public_url(filename)
+    return {
+        "url": public_url,
+        "path": filename,
+        "media_type": "video" if is_video else "photo",
+        **manifest,
+    }
 
 
 @router.post("/work-image")
@@ -72,19 +106,15 @@ async def upload_work_image(
     if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(status_code=400, detail="Invalid image type")
 
-    content = await file.read()
-    if len(content) > MAX_IMAGE_SIZE:
-        raise HTTPException(status_code=400, detail="Image too large (max 5MB)")
-
-    ext = file.filename.split(".")[-1] if file.filename else "jpg"
-    filename = f"work/{uuid4()}.{ext}"
+    detail = "Image too large (max 5MB)"
+    digest = await hash_upload(file, MAX_IMAGE_SIZE, detail)
+    filename = f"work/{digest}.{await _image_extension(file)}"
 
-    supabase.storage.from_("blog-images").upload(
-        filename, content, {"content-type": file.content_type}
-    )
+    created = await upload_to_storage("blog-images", filename, file, MAX_IMAGE_SIZE, detail)
 
-    public_url = supabase.storage.from_("blog-images").get_public_url(filename)
-    return {"url": public_url, "path": filename}
+    manifest = await _image_manifest("blog-images", filename, file, created)
+    public_url = await supabase.storage.from_("blog-images").get_public_url(filename)
+    return {"url": public_url, "path": filename, **manifest}
 
 
 @router.delete("/file")
@@ -97,5 +127,5 @@ async def delete_file(
     if bucket not in allowed_buckets:
         raise HTTPException(status_code=400, detail="Invalid bucket")
 
-    supabase.storage.from_(bucket).remove([path])
+    await supabase.storage.from_(bucket).remove([path])
     return {"message": "File deleted"}
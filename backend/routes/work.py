@@ -1,7 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Optional
 from uuid import UUID
+from postgrest.exceptions import APIError
 from supabase_client import supabase
 from auth import get_current_user
+from cache import cached
+from change_feed import change_feed
+from http_cache import CACHE_DETAIL, CACHE_LIST, conditional_response
+from projection import parse_fields
+from routes.blog import POST_LIST_COLUMNS
+from tiptap import render_html
 from models.work import (
     ExperienceCreate,
     ExperienceUpdate,
@@ -12,15 +20,28 @@ from models.work import (
 
 router = APIRouter()
 
+# The list page only renders cards; descriptions are loaded per experience.
+EXPERIENCE_LIST_COLUMNS = (
+    "id",
+    "title",
+    "slug",
+    "subtitle",
+    "header_image_url",
+    "sort_order",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
 
 # --- Public endpoints ---
 
 
-@router.get("/experiences")
-async def list_experiences():
-    result = (
+@cached("work")
+async def _load_experiences(columns: tuple[str, ...]) -> list[dict]:
+    result = await (
         supabase.table("work_experiences")
-        .select("*")
+        .select(", ".join(columns))
         .eq("is_active", True)
         .order("sort_order")
         .execute()
@@ -28,62 +49,34 @@ async def list_experiences():
     return result.data
 
 
-@router.get("/experiences/{slug}")
-async def get_experience(slug: str):
-    # Fetch the experience by slug
-    result = (
-        supabase.table("work_experiences")
-        .select("*")
-        .eq("slug", slug)
-        .eq("is_active", True)
-        .execute()
-    )
-    if not result.data:
-        raise HTTPException(status_code=404, detail="Experience not found")
-
-    experience = result.data[0]
-    experience_id = experience["id"]
-
-    # Fetch timeline events
-    timeline_result = (
-        supabase.table("work_timeline_events")
-        .select("*")
-        .eq("experience_id", experience_id)
-        .order("event_date", desc=True)
-        .execute()
-    )
-    experience["timeline"] = timeline_result.data
-
-    # Fetch featured posts
-    featured_result = (
-        supabase.table("work_featured_posts")
-        .select("*")
-        .eq("experience_id", experience_id)
-        .order("sort_order")
-        .execute()
-    )
-
-    featured_posts = []
-    if featured_result.data:
-        post_ids = [fp["post_id"] for fp in featured_result.data]
-        posts_result = (
-            supabase.table("blog_posts")
-            .select("*")
-            .in_("id", post_ids)
-            .eq("status", "published")
-            .execute()
-        )
-        # Build a lookup by post id
-        posts_by_id = {p["id"]: p for p in posts_result.data}
+@router.get("/experiences")
+async def list_experiences(request: Request, fields: Optional[str] = None):
+    columns = parse_fields(fields, EXPERIENCE_LIST_COLUMNS)
+    return conditional_response(request, await _load_experiences(columns), CACHE_LIST)
+
+
+@cached("work", "blog_posts")
+async def _load_experience(slug: str) -> Optional[dict]:
+    """An active experience with its timeline and featured posts, or None.
+
+    get_experience_detail (supabase_schema.sql) builds the whole document,
+    ordered, in one round trip.
+    """
+    result = await supabase.rpc("get_experience_detail", {"target_slug": slug}).execute()
+    experience = result.data
+    if not experience:
+        return None
+    if not experience.get("description_html"):
+        experience["description_html"] = render_html(experience.get("description"))
+    return experience
 
-        # Merge in sort_order, preserving the featured_posts ordering
-        for fp in featured_result.data:
-            post = posts_by_id.get(fp["post_id"])
-            if post:
-                featured_posts.append({**post, "sort_order": fp["sort_order"]})
 
-    experience["featured_posts"] = featured_posts
-    return experience
+@router.get("/experiences/{slug}")
+async def get_experience(request: Request, slug: str):
+    experience = await _load_experience(slug)
+    if experience is None:
+        raise HTTPException(status_code=404, detail="Experience not found")
+    return conditional_response(request, experience, CACHE_DETAIL)
 
 
 # --- Admin endpoints ---
@@ -91,7 +84,7 @@ async def get_experience(slug: str):
 
 @router.get("/admin/experiences")
 async def admin_list_experiences(user=Depends(get_current_user)):
-    result = (
+    result = await (
         supabase.table("work_experiences")
         .select("*")
         .order("sort_order")
@@ -104,11 +97,14 @@ async def admin_list_experiences(user=Depends(get_current_user)):
 async def create_experience(
     body: ExperienceCreate, user=Depends(get_current_user)
 ):
-    result = (
-        supabase.table("work_experiences").insert(body.model_dump()).execute()
+    experience_data = body.model_dump()
+    experience_data["description_html"] = render_html(body.description)
+    result = await (
+        supabase.table("work_experiences").insert(experience_data).execute()
     )
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to create experience")
+    change_feed.wrote("work_experiences", result.data)
     return result.data[0]
 
 
@@ -116,11 +112,13 @@ async def create_experience(
 async def update_experience(
     experience_id: UUID, body: ExperienceUpdate, user=Depends(get_current_user)
 ):
-    update_data = body.model_dump(exclude_none=True)
+    update_data = body.model_dump(exclude_none=True, exclude={"description_html"})
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
+    if body.description is not None:
+        update_data["description_html"] = render_html(body.description)
 
-    result = (
+    result = await (
         supabase.table("work_experiences")
         .update(update_data)
         .eq("id", str(experience_id))
@@ -128,6 +126,7 @@ async def update_experience(
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Experience not found")
+    change_feed.wrote("work_experiences", result.data)
     return result.data[0]
 
 
@@ -135,7 +134,7 @@ async def update_experience(
 async def delete_experience(
     experience_id: UUID, user=Depends(get_current_user)
 ):
-    result = (
+    result = await (
         supabase.table("work_experiences")
         .delete()
         .eq("id", str(experience_id))
@@ -143,6 +142,9 @@ async def delete_experience(
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Experience not found")
+    # Its timeline and featured rows go with it (ON DELETE CASCADE)
+    for table in ("work_experiences", "work_timeline_events", "work_featured_posts"):
+        change_feed.wrote(table, ids=[str(experience_id)])
     return {"message": "Experience deleted"}
 
 
@@ -150,7 +152,7 @@ async def delete_experience(
 async def admin_list_timeline_events(
     experience_id: UUID, user=Depends(get_current_user)
 ):
-    result = (
+    result = await (
         supabase.table("work_timeline_events")
         .select("*")
         .eq("experience_id", str(experience_id))
@@ -167,11 +169,12 @@ async def create_timeline_event(
     event_data = body.model_dump()
     event_data["experience_id"] = str(experience_id)
 
-    result = (
+    result = await (
         supabase.table("work_timeline_events").insert(event_data).execute()
     )
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to create timeline event")
+    change_feed.wrote("work_timeline_events", result.data)
     return result.data[0]
 
 
@@ -183,7 +186,7 @@ async def update_timeline_event(
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    result = (
+    result = await (
         supabase.table("work_timeline_events")
         .update(update_data)
         .eq("id", str(event_id))
@@ -191,6 +194,7 @@ async def update_timeline_event(
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Timeline event not found")
+    change_feed.wrote("work_timeline_events", result.data)
     return result.data[0]
 
 
@@ -198,7 +202,7 @@ async def update_timeline_event(
 async def delete_timeline_event(
     event_id: UUID, user=Depends(get_current_user)
 ):
-    result = (
+    result = await (
         supabase.table("work_timeline_events")
         .delete()
         .eq("id", str(event_id))
@@ -206,6 +210,7 @@ async def delete_timeline_event(
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Timeline event not found")
+    change_feed.wrote("work_timeline_events", ids=[str(event_id)])
     return {"message": "Timeline event deleted"}
 
 
@@ -213,7 +218,7 @@ async def delete_timeline_event(
 async def admin_list_featured_posts(
     experience_id: UUID, user=Depends(get_current_user)
 ):
-    featured_result = (
+    featured_result = await (
         supabase.table("work_featured_posts")
         .select("*")
         .eq("experience_id", str(experience_id))
@@ -224,9 +229,9 @@ async def admin_list_featured_posts(
     featured_posts = []
     if featured_result.data:
         post_ids = [fp["post_id"] for fp in featured_result.data]
-        posts_result = (
+        posts_result = await (
             supabase.table("blog_posts")
-            .select("*")
+            .select(", ".join(POST_LIST_COLUMNS))
             .in_("id", post_ids)
             .execute()
         )
@@ -244,26 +249,24 @@ async def admin_list_featured_posts(
 async def update_featured_posts(
     experience_id: UUID, body: FeaturedPostsUpdate, user=Depends(get_current_user)
 ):
-    # Delete all existing featured posts for this experience
-    supabase.table("work_featured_posts").delete().eq(
-        "experience_id", str(experience_id)
-    ).execute()
-
-    # Insert new featured posts
-    if body.posts:
-        rows = [
+    post_ids = [item.post_id for item in body.posts]
+    if len(set(post_ids)) != len(post_ids):
+        raise HTTPException(status_code=400, detail="Duplicate post ids")
+
+    # Adds, removes and re-sorts only what changed, in one transaction
+    try:
+        result = await supabase.rpc(
+            "sync_featured_posts",
             {
-                "experience_id": str(experience_id),
-                "post_id": item.post_id,
-                "sort_order": item.sort_order,
-            }
-            for item in body.posts
-        ]
-        result = supabase.table("work_featured_posts").insert(rows).execute()
-        if not result.data:
-            raise HTTPException(
-                status_code=500, detail="Failed to update featured posts"
-            )
-        return result.data
-
-    return []
+                "target_experience_id": str(experience_id),
+                "posts": [item.model_dump() for item in body.posts],
+            },
+        ).execute()
+    except APIError as exc:
+        if exc.code == "23503":  # foreign_key_violation
+            raise HTTPException(status_code=400, detail="Unknown experience or post")
+        if exc.code == "22P02":  # invalid_text_representation
+            raise HTTPException(status_code=400, detail="Invalid post id")
+        raise
+    change_feed.wrote("work_featured_posts", ids=[str(experience_id)])
+    return result.data
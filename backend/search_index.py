@@ -0,0 +1,92 @@
+import json
+import math
+import re
+from collections import defaultdict
+from html import escape
+
+# In-process stand-in for the Postgres full-text search in
+# supabase_schema.sql, for running locally without the search functions.
+# Terms are matched exactly (no stemming); field weights mirror the
+# tsvector's A/B/C weights.
+
+FIELD_WEIGHTS = {"title": 1.0, "excerpt": 0.4, "content_text": 0.2}
+SNIPPET_WORDS = 30
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def parse_query(query: str) -> tuple[list[str], list[str]]:
+    """Split a search string into required and excluded (`-term`) terms."""
+    required, excluded = [], []
+    for word in query.split():
+        target = excluded if word.startswith("-") else required
+        target.extend(tokenize(word))
+    return required, excluded
+
+
+class SearchIndex:
+    """Inverted index over published posts: term -> {post id: weight}."""
+
+    def __init__(self, posts: list[dict]):
+        self.posts = {post["id"]: post for post in posts}
+        self.postings: dict[str, dict[str, float]] = defaultdict(dict)
+        for post in posts:
+            for field, weight in FIELD_WEIGHTS.items():
+                for term in tokenize(post.get(field) or ""):
+                    scores = self.postings[term]
+                    scores[post["id"]] = scores.get(post["id"], 0.0) + weight
+        # The posts as JSON plus each posting written as "term": {"id": weight}
+        self.size = len(json.dumps(posts, default=str)) + sum(
+            len(term) + 6 + sum(len(pid) + 12 for pid in scores)
+            for term, scores in self.postings.items()
+        )
+
+    def cache_size(self) -> int:
+        """Estimated bytes, for TTLCache's byte budget (JSON can't see inside)."""
+        return self.size
+
+    def search(self, query: str, tag_slugs: list[str] | None = None) -> list[tuple[float, dict]]:
+        """Posts containing every required term, best first, as (rank, post)."""
+        required, excluded = parse_query(query)
+        if not required:
+            return []
+        matches = set(self.postings.get(required[0], {}))
+        for term in required[1:]:
+            matches &= set(self.postings.get(term, {}))
+        for term in excluded:
+            matches -= set(self.postings.get(term, {}))
+        if tag_slugs:
+            wanted = set(tag_slugs)
+            matches = {
+                pid for pid in matches
+                if wanted & {tag["slug"] for tag in self.posts[pid].get("tags", [])}
+            }
+
+        ranked = []
+        for pid in matches:
+            # Damp repeated terms the way ts_rank's length normalisation does
+            score = sum(math.log1p(self.postings[term][pid]) for term in required)
+            ranked.append((round(score, 6), self.posts[pid]))
+        ranked.sort(key=lambda item: (item[0], item[1]["id"]), reverse=True)
+        return ranked
+
+
+def snippet(text: str, query: str) -> str:
+    """Escaped window of `text` around the first match, terms wrapped in <mark>."""
+    required, _ = parse_query(query)
+    terms = set(required)
+    words = text.split()
+    start = next(
+        (i for i, word in enumerate(words) if terms & set(tokenize(word))), 0
+    )
+    start = max(0, start - SNIPPET_WORDS // 3)
+    window = words[start:start + SNIPPET_WORDS]
+    out = [
+        f"<mark>{escape(word)}</mark>" if terms & set(tokenize(word)) else escape(word)
+        for word in window
+    ]
+    return " ".join(out)
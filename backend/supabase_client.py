@@ -1,10 +1,76 @@
-from supabase import create_client
+from supabase import AsyncClient, AsyncClientOptions, acreate_client
 from dotenv import load_dotenv
+import httpx
 import os
+from metrics import HTTPX_EVENT_HOOKS
 
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
\ No newline at end of file
+# One pooled HTTP/2 client shared by the PostgREST, storage and auth calls so
+# every request reuses warm keep-alive connections to Supabase. The transport
+# retries failed connection attempts; callers handle retries of sent requests.
+# Event hooks time each call for the request metrics (see metrics.py).
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+HTTP_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+HTTP_CONNECT_RETRIES = 2
+
+_http_client: httpx.AsyncClient | None = None
+_client: AsyncClient | None = None
+
+
+async def open_supabase(transport: httpx.AsyncBaseTransport | None = None) -> AsyncClient:
+    """Create the shared async Supabase client. Called on app startup.
+
+    `transport` replaces the network transport, e.g. with the in-memory
+    stand-in used by benchmarks/.
+    """
+    global _http_client, _client
+    _http_client = httpx.AsyncClient(
+        transport=transport or httpx.AsyncHTTPTransport(
+            http2=True, limits=HTTP_LIMITS, retries=HTTP_CONNECT_RETRIES
+        ),
+        timeout=HTTP_TIMEOUT,
+        follow_redirects=True,
+        event_hooks=HTTPX_EVENT_HOOKS,
+    )
+    _client = await acreate_client(
+        SUPABASE_URL,
+        SUPABASE_KEY,
+        options=AsyncClientOptions(httpx_client=_http_client),
+    )
+    return _client
+
+
+async def close_supabase():
+    """Close the pooled connections. Called on app shutdown."""
+    global _http_client, _client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The pooled HTTP client, for Supabase endpoints supabase-py doesn't cover."""
+    if _http_client is None:
+        raise RuntimeError("Supabase client is not open; is the app lifespan running?")
+    return _http_client
+
+
+class _SupabaseProxy:
+    """Module-level handle that forwards to the client opened at startup.
+
+    Routers import `supabase` once at import time, before the app lifespan
+    has run, so they hold this proxy rather than the client itself.
+    """
+
+    def __getattr__(self, name):
+        if _client is None:
+            raise RuntimeError("Supabase client is not open; is the app lifespan running?")
+        return getattr(_client, name)
+
+
+supabase = _SupabaseProxy()
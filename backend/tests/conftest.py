@@ -0,0 +1,56 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+# Tests never talk to a real project; the app reads these at import time
+os.environ.update(
+    SUPABASE_URL="http://supabase.test",
+    SUPABASE_SERVICE_ROLE_KEY="test",
+    SUPABASE_JWT_SECRET="test-secret",
+    SUPABASE_JWKS_URL="",
+    CHANGE_FEED="off",
+)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import asyncio  # noqa: E402
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from jose import jwt  # noqa: E402
+from benchmarks.fake_postgrest import FakePostgrest  # noqa: E402
+from cache import public_cache  # noqa: E402
+from main import app  # noqa: E402
+from supabase_client import close_supabase, open_supabase  # noqa: E402
+
+
+@pytest.fixture
+def db() -> FakePostgrest:
+    """An empty in-memory database built from supabase_schema.sql."""
+    public_cache.clear()
+    return FakePostgrest.from_schema()
+
+
+@pytest.fixture
+def admin() -> dict:
+    """Headers for an authenticated admin request."""
+    claims = {"sub": "00000000-0000-0000-0000-0000000000aa", "aud": "authenticated", "exp": int(time.time()) + 3600}
+    return {"Authorization": f"Bearer {jwt.encode(claims, 'test-secret', algorithm='HS256')}"}
+
+
+@pytest.fixture
+def api(db):
+    """send(method, path, **kwargs) -> httpx.Response, with the app's Supabase calls answered by `db`."""
+
+    def send(method: str, path: str, **kwargs) -> httpx.Response:
+        async def run():
+            await open_supabase(transport=db)
+            try:
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    return await client.request(method, path, **kwargs)
+            finally:
+                await close_supabase()
+
+        return asyncio.run(run())
+
+    return send
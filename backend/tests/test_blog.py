@@ -0,0 +1,62 @@
+import base64
+import json
+
+DOC = {"type": "doc", "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Hello world"}]}]}
+
+
+def _post(**fields) -> dict:
+    return {"title": "Hello", "slug": "hello", "content": DOC, **fields}
+
+
+def test_create_with_unknown_tag_leaves_no_post(api, db, admin):
+    unknown = "00000000-0000-0000-0000-000000000999"
+    response = api("POST", "/api/blog/admin/posts", json=_post(tag_ids=[unknown]), headers=admin)
+    assert response.status_code == 400
+    assert db.tables["blog_posts"].rows == []
+
+    tag = db.insert("blog_tags", {"name": "News", "slug": "news"})
+    response = api("POST", "/api/blog/admin/posts", json=_post(tag_ids=[tag["id"]]), headers=admin)
+    assert response.status_code == 200
+    assert [t["slug"] for t in response.json()["tags"]] == ["news"]
+
+
+def test_duplicate_slug_is_a_conflict(api, admin):
+    assert api("POST", "/api/blog/admin/posts", json=_post(), headers=admin).status_code == 200
+    response = api("POST", "/api/blog/admin/posts", json=_post(title="Again"), headers=admin)
+    assert response.status_code == 409
+
+
+def _doc(text: str) -> dict:
+    return {"type": "doc", "content": [{"type": "paragraph", "content": [{"type": "text", "text": text}]}]}
+
+
+def test_derived_excerpt_follows_content_until_the_author_writes_one(api, admin):
+    post = api("POST", "/api/blog/admin/posts", json=_post(content=_doc("First draft")), headers=admin).json()
+    assert (post["excerpt"], post["excerpt_auto"]) == ("First draft", True)
+    url = f"/api/blog/admin/posts/{post['id']}"
+
+    # The editor sends the derived excerpt back with every save
+    post = api("PUT", url, json={"excerpt": post["excerpt"], "content": _doc("Second draft")}, headers=admin).json()
+    assert (post["excerpt"], post["excerpt_auto"]) == ("Second draft", True)
+
+    post = api("PUT", url, json={"excerpt": "Written by hand", "content": _doc("Third")}, headers=admin).json()
+    assert (post["excerpt"], post["excerpt_auto"]) == ("Written by hand", False)
+    post = api("PUT", url, json={"excerpt": "Written by hand", "content": _doc("Fourth")}, headers=admin).json()
+    assert post["excerpt"] == "Written by hand"
+
+    post = api("PUT", url, json={"excerpt": "", "content": _doc("Fifth")}, headers=admin).json()
+    assert (post["excerpt"], post["excerpt_auto"]) == ("Fifth", True)
+
+
+def _cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+def test_malformed_cursors_are_rejected(api):
+    post_id = "00000000-0000-0000-0000-000000000001"
+    for cursor in (_cursor(["next", None, 5]), _cursor(["next", 5, post_id]), "not-a-cursor"):
+        response = api("GET", "/api/blog/posts", params={"cursor": cursor})
+        assert response.status_code == 400, cursor
+    for cursor in (_cursor([0.5, 5]), _cursor([[1], post_id])):
+        response = api("GET", "/api/blog/search", params={"q": "hello", "cursor": cursor})
+        assert response.status_code == 400, cursor
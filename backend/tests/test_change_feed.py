@@ -0,0 +1,28 @@
+from change_feed import ChangeFeed
+
+STAMP = "2024-01-01T00:00:00+00:00"
+
+
+def _event(table, kind="UPDATE", record=None, old_record=None):
+    return {"data": {"table": table, "type": kind, "record": record, "old_record": old_record}}
+
+
+def test_echoes_of_api_writes_are_skipped():
+    feed = ChangeFeed("off", 60)
+    feed.wrote("portfolio_items", [{"id": "a", "updated_at": STAMP}])
+    feed.wrote("blog_post_tags", ids=["p"])
+    feed.wrote("work_featured_posts", ids=["e"])
+
+    feed._on_change(_event("portfolio_items", record={"id": "a", "updated_at": "2024-01-01T00:00:00Z"}))
+    feed._on_change(_event("blog_post_tags", "DELETE", old_record={"post_id": "p", "tag_id": "t"}))
+    feed._on_change(_event("work_featured_posts", "DELETE", old_record={"id": "f", "experience_id": "e"}))
+    assert feed._changed == set()
+
+
+def test_other_edits_are_applied():
+    feed = ChangeFeed("off", 60)
+    feed.wrote("portfolio_items", [{"id": "a", "updated_at": STAMP}])
+
+    feed._on_change(_event("portfolio_items", record={"id": "a", "updated_at": "2024-01-02T00:00:00Z"}))
+    feed._on_change(_event("blog_post_tags", "INSERT", record={"post_id": "q", "tag_id": "t"}))
+    assert feed._changed == {"portfolio_items", "blog_post_tags"}
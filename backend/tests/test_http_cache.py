@@ -0,0 +1,18 @@
+from http_cache import validators
+
+ROW = {"id": "a", "updated_at": "2024-01-01T00:00:00+00:00", "sort_order": 1}
+
+
+def test_single_row_has_last_modified():
+    _, last_modified = validators(ROW)
+    assert last_modified is not None and last_modified.year == 2024
+
+
+def test_lists_and_rows_with_lists_rely_on_the_etag():
+    assert validators([ROW])[1] is None
+    assert validators({"posts": [ROW]})[1] is None
+    assert validators({**ROW, "tags": []})[1] is None
+
+
+def test_etag_changes_with_sort_order():
+    assert validators([ROW])[0] != validators([{**ROW, "sort_order": 2}])[0]
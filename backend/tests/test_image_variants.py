@@ -0,0 +1,36 @@
+import io
+from PIL import Image
+from image_variants import VARIANT_WIDTHS, _render_variants, _variant_widths, image_extension
+
+
+def _png(width: int, height: int, mode: str = "RGB") -> bytes:
+    out = io.BytesIO()
+    Image.new(mode, (width, height)).save(out, format="PNG")
+    return out.getvalue()
+
+
+def test_variant_widths_never_repeat():
+    assert _variant_widths(5000) == list(VARIANT_WIDTHS)
+    assert _variant_widths(1600) == list(VARIANT_WIDTHS)
+    assert _variant_widths(700) == [320, 640, 700]
+    assert _variant_widths(200) == [200]
+
+
+def test_wide_image_encodes_each_variant_once():
+    width, height, variants = _render_variants(_png(5000, 500), ["webp"])
+    assert (width, height) == (5000, 500)
+    assert [target for _, target, _ in variants] == list(VARIANT_WIDTHS)
+
+
+def test_alpha_survives_conversion():
+    _, _, variants = _render_variants(_png(400, 300, "LA"), ["webp"])
+    with Image.open(io.BytesIO(variants[0][2])) as variant:
+        assert variant.mode == "RGBA"
+
+
+def test_extension_comes_from_the_image_format():
+    out = io.BytesIO()
+    Image.new("RGB", (4, 4)).save(out, format="WEBP")
+    out.seek(0)
+    assert image_extension(out) == "webp"
+    assert image_extension(io.BytesIO(b"<script></script>")) is None
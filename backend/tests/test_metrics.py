@@ -0,0 +1,14 @@
+from metrics import render_metrics
+
+
+def test_routes_are_labelled_with_their_prefixed_template(api):
+    assert [api("GET", path).status_code for path in ("/api/settings", "/api/blog/posts", "/api/nope")] == [
+        200, 200, 404,
+    ]
+    text = render_metrics()
+    assert 'route="/api/settings"' in text
+    assert 'route="/api/blog/posts"' in text
+    assert 'route="/posts"' not in text
+    # Only the real 404 is unmatched
+    assert 'http_request_duration_seconds_count{method="GET",route="unmatched",status="404"} 1' in text
+    assert 'route="unmatched",status="200"' not in text
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import math
+import re
+from html import escape
+from cache import TTLCache
+
+# Helpers for the TipTap (ProseMirror) JSON documents stored in
+# `blog_posts.content` and `work_experiences.description`.
+
+WORDS_PER_MINUTE = 220
+EXCERPT_LENGTH = 200
+TOC_LEVELS = (2, 3)
+
+# Nodes whose text forms one run of prose; their children are inline.
+TEXT_BLOCKS = {"paragraph", "heading", "codeBlock"}
+
+# Bump when the HTML output changes so cached renders aren't reused.
+RENDERER_VERSION = 1
+
+# Block nodes that map straight onto one element wrapping their children.
+BLOCK_TAGS = {
+    "paragraph": "p",
+    "blockquote": "blockquote",
+    "bulletList": "ul",
+    "listItem": "li",
+}
+MARK_TAGS = {
+    "bold": "strong",
+    "italic": "em",
+    "underline": "u",
+    "strike": "s",
+    "code": "code",
+}
+SAFE_URL = re.compile(r"^(https?:|mailto:|/(?!/)|#)", re.IGNORECASE)
+
+_render_cache = TTLCache(max_entries=256, max_bytes=8 * 1024 * 1024, ttl=math.inf)
+
+
+def node_text(node: dict) -> str:
+    """Plain text of a node and everything under it."""
+    if node.get("type") == "text":
+        return node.get("text", "")
+    if node.get("type") == "hardBreak":
+        return " "
+    return "".join(node_text(child) for child in node.get("content", []))
+
+
+def _text_blocks(node: dict):
+    """Yield (node, text) for every paragraph, heading and code block in order."""
+    if node.get("type") in TEXT_BLOCKS:
+        yield node, node_text(node)
+        return
+    for child in node.get("content", []):
+        yield from _text_blocks(child)
+
+
+def slugify(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "section"
+
+
+def heading_ids(doc: dict) -> list[tuple[dict, str]]:
+    """Unique anchor ids for the document's headings, in order."""
+    seen: dict[str, int] = {}
+    ids = []
+    for node, text in _text_blocks(doc):
+        if node.get("type") != "heading":
+            continue
+        base = slugify(text)
+        count = seen.get(base, 0)
+        seen[base] = count + 1
+        ids.append((node, base if count == 0 else f"{base}-{count}"))
+    return ids
+
+
+def _excerpt(paragraphs: list[str]) -> str:
+    text = ""
+    for paragraph in paragraphs:
+        text = f"{text} {paragraph}".strip()
+        if len(text) >= EXCERPT_LENGTH:
+            break
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    cut = text[:EXCERPT_LENGTH].rsplit(" ", 1)[0]
+    return f"{cut.rstrip(' .,;:')}…"
+
+
+def document_stats(doc: dict | None) -> dict:
+    """Word count, reading time, a plain-text excerpt and a table of contents.
+
+    Computed when a post is saved so list views can show them without
+    shipping or parsing the document. `content_text` is the document's
+    plain text, which feeds the search index.
+    """
+    doc = doc or {}
+    blocks = list(_text_blocks(doc))
+    words = sum(len(text.split()) for _, text in blocks)
+    toc = [
+        {"level": node.get("attrs", {}).get("level"), "text": node_text(node).strip(), "id": anchor}
+        for node, anchor in heading_ids(doc)
+        if node.get("attrs", {}).get("level") in TOC_LEVELS
+    ]
+    paragraphs = [
+        text.strip() for node, text in blocks if node.get("type") == "paragraph" and text.strip()
+    ]
+    return {
+        "word_count": words,
+        "reading_time_minutes": math.ceil(words / WORDS_PER_MINUTE),
+        "excerpt": _excerpt(paragraphs),
+        "toc": toc,
+        "content_text": "\n".join(text for _, text in blocks),
+    }
+
+
+def _safe_url(url) -> str | None:
+    if isinstance(url, str) and SAFE_URL.match(url.strip()):
+        return url.strip()
+    return None
+
+
+def _render_text(node: dict) -> str:
+    out = escape(node.get("text", ""), quote=False)
+    # Marks are listed outermost first, so wrap from the innermost out
+    for mark in reversed(node.get("marks", [])):
+        kind = mark.get("type")
+        if kind in MARK_TAGS:
+            tag = MARK_TAGS[kind]
+            out = f"<{tag}>{out}</{tag}>"
+        elif kind == "link":
+            href = _safe_url(mark.get("attrs", {}).get("href"))
+            if href:
+                out = (
+                    f'<a href="{escape(href)}" target="_blank" '
+                    f'rel="noopener noreferrer nofollow">{out}</a>'
+                )
+    return out
+
+
+def _render_node(node: dict, anchors: dict[int, str]) -> str:
+    kind = node.get("type")
+    attrs = node.get("attrs") or {}
+    inner = "".join(_render_node(child, anchors) for child in node.get("content", []))
+
+    if kind == "text":
+        return _render_text(node)
+    if kind in BLOCK_TAGS:
+        tag = BLOCK_TAGS[kind]
+        return f"<{tag}>{inner}</{tag}>"
+    if kind == "heading":
+        level = attrs.get("level") if attrs.get("level") in range(1, 7) else 2
+        return f'<h{level} id="{anchors[id(node)]}">{inner}</h{level}>'
+    if kind == "orderedList":
+        start = attrs.get("start")
+        start_attr = f' start="{start}"' if isinstance(start, int) and start != 1 else ""
+        return f"<ol{start_attr}>{inner}</ol>"
+    if kind == "codeBlock":
+        language = attrs.get("language")
+        cls = f' class="language-{escape(language)}"' if isinstance(language, str) else ""
+        return f"<pre><code{cls}>{escape(node_text(node), quote=False)}</code></pre>"
+    if kind == "hardBreak":
+        return "<br>"
+    if kind == "horizontalRule":
+        return "<hr>"
+    if kind == "image":
+        src = _safe_url(attrs.get("src"))
+        if not src:
+            return ""
+        alt = escape(attrs.get("alt") or "")
+        title = f' title="{escape(attrs["title"])}"' if attrs.get("title") else ""
+        return f'<img src="{escape(src)}" alt="{alt}"{title} loading="lazy">'
+    # doc, and any node type the renderer doesn't know, contributes its children
+    return inner
+
+
+def render_html(doc: dict | None) -> str:
+    """Render a TipTap document to HTML, matching the editor's own output.
+
+    Text and attributes are escaped and only http(s), mailto and relative
+    URLs are kept, so the result is safe to serve as is. Headings get the
+    same anchor ids as the table of contents from `document_stats`. Renders
+    are cached by a hash of the document.
+    """
+    if not doc:
+        return ""
+    raw = json.dumps(doc, sort_keys=True, separators=(",", ":"))
+    key = (RENDERER_VERSION, hashlib.sha256(raw.encode()).digest())
+    html = _render_cache.get(key)
+    if html is None:
+        anchors = {id(node): anchor for node, anchor in heading_ids(doc)}
+        html = _render_node(doc, anchors)
+        _render_cache.set(key, html)
+    return html
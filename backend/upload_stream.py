@@ -0,0 +1,205 @@
+import base64
+import hashlib
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+import httpx
+from storage3.exceptions import StorageApiError
+from supabase_client import SUPABASE_URL, SUPABASE_KEY, supabase, get_http_client
+
+# Supabase's resumable (TUS) endpoint requires 6MB chunks; it is also the
+# most a single upload request holds in memory.
+CHUNK_SIZE = 6 * 1024 * 1024
+CHUNK_RETRIES = 3
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Objects live under content-hash paths, so a given path never changes and
+# can be cached for a year.
+IMMUTABLE_CACHE_SECONDS = "31536000"
+
+# Room for multipart boundaries and form fields on top of the file itself.
+MULTIPART_OVERHEAD = 64 * 1024
+
+TUS_URL = f"{SUPABASE_URL}/storage/v1/upload/resumable"
+TUS_HEADERS = {
+    "apikey": SUPABASE_KEY,
+    "Authorization": f"Bearer {SUPABASE_KEY}",
+    "Tus-Resumable": "1.0.0",
+}
+
+
+class BodySizeLimitMiddleware:
+    """Reject request bodies over a per-path byte limit before they are buffered.
+
+    A declared Content-Length over the limit is refused immediately; bodies
+    without one (or that lie about it) are cut off with a 413 as soon as the
+    running total crosses the limit, before the multipart parser spools the
+    rest to disk.
+    """
+
+    def __init__(self, app, limits: dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit += MULTIPART_OVERHEAD
+        detail = f"Upload too large (max {limit // (1024 * 1024)}MB)"
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse({"detail": detail}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def check_upload_size(file: UploadFile, max_size: int, detail: str):
+    """Reject a spooled upload over `max_size` without reading it."""
+    if file.size is not None and file.size > max_size:
+        raise HTTPException(status_code=413, detail=detail)
+
+
+async def hash_upload(file: UploadFile, max_size: int, detail: str) -> str:
+    """SHA-256 of an upload, read in chunks while enforcing `max_size`."""
+    check_upload_size(file, max_size, detail)
+    await file.seek(0)
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := await file.read(HASH_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_size:
+            raise HTTPException(status_code=413, detail=detail)
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_duplicate(exc: StorageApiError) -> bool:
+    return str(exc.status) == "409"
+
+
+async def upload_to_storage(
+    bucket: str, path: str, file: UploadFile, max_size: int, detail: str
+) -> bool:
+    """Copy an upload into Supabase storage without holding it all in memory.
+
+    Files that fit in one chunk go through the regular storage API; larger
+    ones are sent chunk by chunk over the resumable (TUS) protocol. Paths
+    are content-addressed, so an existing object is left as is. Returns
+    whether a new object was written.
+    """
+    check_upload_size(file, max_size, detail)
+    await file.seek(0)
+    if file.size is not None and file.size <= CHUNK_SIZE:
+        content = await file.read(max_size + 1)
+        if len(content) > max_size:
+            raise HTTPException(status_code=413, detail=detail)
+        try:
+            await supabase.storage.from_(bucket).upload(
+                path,
+                content,
+                {"content-type": file.content_type, "cache-control": IMMUTABLE_CACHE_SECONDS},
+            )
+        except StorageApiError as exc:
+            if not _is_duplicate(exc):
+                raise
+            return False
+        return True
+
+    # Check first rather than finding out after streaming the whole file
+    if await supabase.storage.from_(bucket).exists(path):
+        return False
+    return await _upload_resumable(bucket, path, file, max_size, detail)
+
+
+def _tus_metadata(**fields: str) -> str:
+    return ",".join(
+        f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in fields.items()
+    )
+
+
+async def _upload_resumable(
+    bucket: str, path: str, file: UploadFile, max_size: int, detail: str
+) -> bool:
+    client = get_http_client()
+    size = file.size
+    if size is None:
+        raise HTTPException(status_code=411, detail="Upload size unknown")
+
+    create = await client.post(
+        TUS_URL,
+        headers={
+            **TUS_HEADERS,
+            "Upload-Length": str(size),
+            "Upload-Metadata": _tus_metadata(
+                bucketName=bucket,
+                objectName=path,
+                contentType=file.content_type or "application/octet-stream",
+                cacheControl=IMMUTABLE_CACHE_SECONDS,
+            ),
+        },
+    )
+    if create.status_code == 409:
+        return False
+    if create.status_code != 201 or "location" not in create.headers:
+        raise HTTPException(status_code=502, detail="Failed to start upload")
+    location = create.headers["location"]
+
+    offset = 0
+    while offset < size:
+        await file.seek(offset)
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            raise HTTPException(status_code=400, detail="Upload ended early")
+        if offset + len(chunk) > max_size:
+            raise HTTPException(status_code=413, detail=detail)
+        offset = await _send_chunk(client, location, offset, chunk)
+    return True
+
+
+async def _send_chunk(client: httpx.AsyncClient, location: str, offset: int, chunk: bytes) -> int:
+    """PATCH one chunk, resuming from the server's offset after a failure."""
+    for attempt in range(CHUNK_RETRIES):
+        try:
+            resp = await client.patch(
+                location,
+                content=chunk,
+                headers={
+                    **TUS_HEADERS,
+                    "Upload-Offset": str(offset),
+                    "Content-Type": "application/offset+octet-stream",
+                },
+            )
+            if resp.status_code == 204:
+                return int(resp.headers["upload-offset"])
+        except httpx.TransportError:
+            pass
+
+        # Ask the server how much it actually stored before retrying
+        try:
+            head = await client.head(location, headers=TUS_HEADERS)
+            stored = int(head.headers["upload-offset"])
+        except (httpx.TransportError, KeyError, ValueError):
+            continue
+        if stored >= offset + len(chunk):
+            return stored
+        chunk = chunk[stored - offset:] if stored > offset else chunk
+        offset = max(offset, stored)
+
+    raise HTTPException(status_code=502, detail="Upload to storage failed")
@@ -13,13 +13,23 @@ function BlogCard({ post }) {
         <Link to={`/blog/${post.slug}`} className={styles.card}>
             {post.cover_image_url && (
                 <div className={styles.imageWrapper}>
-                    <img src={post.cover_image_url} alt={post.title} className={styles.image} />
+                    <picture className={styles.picture}>
+                        {Object.entries(post.cover_image_srcset || {}).map(([type, srcSet]) => (
+                            <source key={type} type={type} srcSet={srcSet} sizes="(max-width: 768px) 100vw, 33vw" />
+                        ))}
+                        <img src={post.cover_image_url} alt={post.title} loading="lazy" className={styles.image} />
+                    </picture>
                 </div>
             )}
             <div className={styles.body}>
                 <h3 className={styles.title}>{post.title}</h3>
                 {post.excerpt && <p className={styles.excerpt}>{post.excerpt}</p>}
-                {date && <span className={styles.date}>{date}</span>}
+                {date && (
+                    <span className={styles.date}>
+                        {date}
+                        {post.reading_time_minutes > 0 && ` · ${post.reading_time_minutes} min read`}
+                    </span>
+                )}
                 {post.tags?.length > 0 && (
                     <div className={styles.tags}>
                         {post.tags.map(tag => (
@@ -16,7 +16,19 @@ function MediaCard({ item, onClick }) {
                     <span className={styles.videoBadge}>Video</span>
                 </div>
             ) : (
-                <img src={item.media_url} alt={item.title} className={styles.image} />
+                <picture className={styles.picture}>
+                    {Object.entries(item.media_srcset || {}).map(([type, srcSet]) => (
+                        <source key={type} type={type} srcSet={srcSet} sizes="(max-width: 768px) 100vw, 33vw" />
+                    ))}
+                    <img
+                        src={item.media_url}
+                        alt={item.title}
+                        width={item.width || undefined}
+                        height={item.height || undefined}
+                        loading="lazy"
+                        className={styles.image}
+                    />
+                </picture>
             )}
             <div className={styles.overlay}>
                 <h3 className={styles.title}>{item.title}</h3>
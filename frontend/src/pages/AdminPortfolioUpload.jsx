@@ -14,6 +14,7 @@ function AdminPortfolioUpload() {
     const [category, setCategory] = useState('');
     const [mediaUrl, setMediaUrl] = useState('');
     const [mediaType, setMediaType] = useState('photo');
+    const [mediaMeta, setMediaMeta] = useState({});
     const [uploading, setUploading] = useState(false);
     const [saving, setSaving] = useState(false);
 
@@ -23,6 +24,11 @@ function AdminPortfolioUpload() {
             const result = await uploadApi.uploadPortfolioMedia(file);
             setMediaUrl(result.url);
             setMediaType(result.media_type);
+            setMediaMeta({
+                width: result.width ?? null,
+                height: result.height ?? null,
+                media_srcset: result.srcset ?? null,
+            });
         } catch (err) {
             console.error('Upload failed:', err);
         } finally {
@@ -41,6 +47,7 @@ function AdminPortfolioUpload() {
                 category: category || null,
                 media_url: mediaUrl,
                 media_type: mediaType,
+                ...mediaMeta,
             })).unwrap();
             navigate('/admin/portfolio');
         } catch (err) {
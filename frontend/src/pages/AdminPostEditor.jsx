@@ -19,6 +19,7 @@ function AdminPostEditor() {
     const [slug, setSlug] = useState('');
     const [excerpt, setExcerpt] = useState('');
     const [coverImageUrl, setCoverImageUrl] = useState('');
+    const [coverImageSrcset, setCoverImageSrcset] = useState(null);
     const [content, setContent] = useState(null);
     const [contentHtml, setContentHtml] = useState('');
     const [selectedTags, setSelectedTags] = useState([]);
@@ -36,8 +37,10 @@ function AdminPostEditor() {
         if (isEdit && currentPost) {
             setTitle(currentPost.title || '');
             setSlug(currentPost.slug || '');
-            setExcerpt(currentPost.excerpt || '');
+            // A derived excerpt stays blank here so saving keeps it derived
+            setExcerpt(currentPost.excerpt_auto ? '' : currentPost.excerpt || '');
             setCoverImageUrl(currentPost.cover_image_url || '');
+            setCoverImageSrcset(currentPost.cover_image_srcset || null);
             setContent(currentPost.content || null);
             setContentHtml(currentPost.content_html || '');
             setSelectedTags(currentPost.tags?.map(t => t.id) || []);
@@ -67,6 +70,8 @@ function AdminPostEditor() {
         try {
             const result = await uploadApi.uploadBlogImage(file, 'covers');
             setCoverImageUrl(result.url);
+            // {} rather than null so a GIF cover replaces an old srcset
+            setCoverImageSrcset(result.srcset ?? {});
         } catch (err) {
             console.error('Cover upload failed:', err);
         }
@@ -90,6 +95,7 @@ function AdminPostEditor() {
             content: content || { type: 'doc', content: [] },
             content_html: contentHtml,
             cover_image_url: coverImageUrl || null,
+            cover_image_srcset: coverImageSrcset,
             status,
             tag_ids: selectedTags,
         };
@@ -162,7 +168,10 @@ function AdminPostEditor() {
                         <textarea
                             value={excerpt}
                             onChange={(e) => setExcerpt(e.target.value)}
-                            placeholder="Brief description for preview cards..."
+                            placeholder={
+                                (isEdit && currentPost?.excerpt_auto && currentPost.excerpt)
+                                || 'Brief description for preview cards (generated from the post if left blank)...'
+                            }
                             className={styles.excerptInput}
                             rows={3}
                         />
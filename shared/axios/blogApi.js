@@ -7,6 +7,14 @@ const fetchPublishedPosts = async (page = 1, tag = null) => {
     return response.data;
 };
 
+const searchPosts = async (q, { tags = [], cursor = null } = {}) => {
+    const params = new URLSearchParams({ q });
+    tags.forEach((tag) => params.append('tags', tag));
+    if (cursor) params.set('cursor', cursor);
+    const response = await axiosClient.get('/blog/search', { params });
+    return response.data;
+};
+
 const getPostBySlug = async (slug) => {
     const response = await axiosClient.get(`/blog/posts/${slug}`);
     return response.data;
@@ -64,6 +72,7 @@ const deleteTag = async (id) => {
 
 const blogApi = {
     fetchPublishedPosts,
+    searchPosts,
     getPostBySlug,
     fetchAdminPosts,
     getAdminPost,
@@ -0,0 +1,12 @@
+import axiosClient from './axiosClient';
+
+const getBootstrap = async () => {
+    const response = await axiosClient.get('/bootstrap');
+    return response.data;
+};
+
+const bootstrapApi = {
+    getBootstrap,
+};
+
+export default bootstrapApi;
@@ -41,6 +41,21 @@ const reorderItem = async (id, sortOrder) => {
     return response.data;
 };
 
+const setItemOrder = async (itemIds) => {
+    const response = await axiosClient.put('/portfolio/admin/items/order', {
+        item_ids: itemIds,
+    });
+    return response.data;
+};
+
+const moveItem = async (id, { afterId = null, beforeId = null }) => {
+    const response = await axiosClient.patch(`/portfolio/admin/items/${id}/move`, {
+        after_id: afterId,
+        before_id: beforeId,
+    });
+    return response.data;
+};
+
 const portfolioApi = {
     fetchItems,
     getItem,
@@ -49,6 +64,8 @@ const portfolioApi = {
     updateItem,
     deleteItem,
     reorderItem,
+    setItemOrder,
+    moveItem,
 };
 
 export default portfolioApi;
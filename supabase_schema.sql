@@ -9,9 +9,11 @@ CREATE TABLE public.blog_posts (
     title TEXT NOT NULL,
     slug TEXT NOT NULL UNIQUE,
     excerpt TEXT,
+    excerpt_auto BOOLEAN NOT NULL DEFAULT false,  -- excerpt was derived from content
     content JSONB NOT NULL DEFAULT '{}',
     content_html TEXT,
     cover_image_url TEXT,
+    cover_image_srcset JSONB,  -- {"image/webp": "<url> 320w, ...", ...} from the upload pipeline
     status TEXT NOT NULL DEFAULT 'draft'
         CHECK (status IN ('draft', 'published', 'archived')),
     author_id UUID REFERENCES auth.users(id),
@@ -19,11 +21,56 @@ CREATE TABLE public.blog_posts (
     created_at TIMESTAMPTZ DEFAULT now(),
     updated_at TIMESTAMPTZ DEFAULT now(),
     meta_title TEXT,
-    meta_description TEXT
+    meta_description TEXT,
+    -- Derived from `content` on save (see backend/tiptap.py)
+    word_count INT NOT NULL DEFAULT 0,
+    reading_time_minutes INT NOT NULL DEFAULT 0,
+    toc JSONB NOT NULL DEFAULT '[]',
+    content_text TEXT,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(excerpt, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(content_text, '')), 'C')
+    ) STORED
 );
 
-CREATE INDEX idx_blog_posts_status_published ON blog_posts (status, published_at DESC);
+CREATE INDEX idx_blog_posts_status_published ON blog_posts (status, published_at DESC NULLS LAST, id DESC);
 CREATE INDEX idx_blog_posts_slug ON blog_posts (slug);
+CREATE INDEX idx_blog_posts_search ON blog_posts USING GIN (search_vector);
+
+-- Migration: posts published through PUT /api/blog/admin/posts/{id} before
+-- it set published_at were left undated. Date them from their last edit
+-- (the old value; the trigger then bumps updated_at). Safe to re-run.
+UPDATE blog_posts SET published_at = coalesce(updated_at, created_at, now())
+WHERE status = 'published' AND published_at IS NULL;
+
+-- Existing databases also need the index rebuilt with NULLS LAST:
+--   DROP INDEX idx_blog_posts_status_published;
+--   CREATE INDEX idx_blog_posts_status_published ON blog_posts (status, published_at DESC NULLS LAST, id DESC);
+
+-- Migration: derived excerpts are flagged so they keep following the content.
+ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS excerpt_auto BOOLEAN NOT NULL DEFAULT false;
+
+-- Migration: cover image variants, listed on post cards.
+ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS cover_image_srcset JSONB;
+
+-- Migration: document stats and full-text search, derived from `content` on save.
+ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS word_count INT NOT NULL DEFAULT 0;
+ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS reading_time_minutes INT NOT NULL DEFAULT 0;
+ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS toc JSONB NOT NULL DEFAULT '[]';
+ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS content_text TEXT;
+ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(title, '')), 'A')
+    || setweight(to_tsvector('english', coalesce(excerpt, '')), 'B')
+    || setweight(to_tsvector('english', coalesce(content_text, '')), 'C')
+) STORED;
+CREATE INDEX IF NOT EXISTS idx_blog_posts_search ON blog_posts USING GIN (search_vector);
+
+-- Posts saved before content_text existed can be backfilled with:
+--   UPDATE blog_posts SET content_text = (
+--       SELECT string_agg(t #>> '{}', ' ') FROM jsonb_path_query(content, 'strict $.**.text') t
+--   ) WHERE content_text IS NULL;
+-- Their word_count, reading_time_minutes and toc are filled in on their next save.
 
 -- Blog Tags
 CREATE TABLE public.blog_tags (
@@ -52,6 +99,7 @@ CREATE TABLE public.portfolio_items (
     sort_order INT DEFAULT 0,
     width INT,
     height INT,
+    media_srcset JSONB,  -- {"image/webp": "<url> 320w, ...", ...} from the upload pipeline
     is_featured BOOLEAN DEFAULT false,
     created_at TIMESTAMPTZ DEFAULT now(),
     updated_at TIMESTAMPTZ DEFAULT now()
@@ -60,6 +108,11 @@ CREATE TABLE public.portfolio_items (
 CREATE INDEX idx_portfolio_items_category ON portfolio_items (category);
 CREATE INDEX idx_portfolio_items_featured ON portfolio_items (is_featured, sort_order);
 
+-- Migration: image dimensions and variants from the upload pipeline.
+ALTER TABLE portfolio_items ADD COLUMN IF NOT EXISTS width INT;
+ALTER TABLE portfolio_items ADD COLUMN IF NOT EXISTS height INT;
+ALTER TABLE portfolio_items ADD COLUMN IF NOT EXISTS media_srcset JSONB;
+
 -- Athletics Services
 CREATE TABLE public.athletics_services (
     id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
@@ -182,6 +235,378 @@ CREATE TRIGGER set_updated_at BEFORE UPDATE ON work_timeline_events
 CREATE TRIGGER set_updated_at BEFORE UPDATE ON influences
     FOR EACH ROW EXECUTE FUNCTION update_updated_at();
 
+-- ============================================
+-- Blog search (GET /api/blog/search)
+-- ============================================
+
+-- One page of published posts matching `search_query`, best first, keyset
+-- paginated on (rank, id). Snippets are only built for the returned page;
+-- content_text is HTML-escaped before ts_headline adds <mark> tags.
+CREATE OR REPLACE FUNCTION search_blog_posts(
+    search_query TEXT,
+    tag_slugs TEXT[] DEFAULT NULL,
+    after_rank REAL DEFAULT NULL,
+    after_id UUID DEFAULT NULL,
+    max_results INT DEFAULT 10
+)
+RETURNS TABLE (
+    id UUID,
+    title TEXT,
+    slug TEXT,
+    excerpt TEXT,
+    cover_image_url TEXT,
+    published_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ,
+    reading_time_minutes INT,
+    rank REAL,
+    snippet TEXT,
+    total_matches BIGINT
+)
+LANGUAGE sql STABLE AS $$
+    WITH query AS (
+        SELECT websearch_to_tsquery('english', search_query) AS q
+    ),
+    matches AS (
+        SELECT p.id, p.title, p.slug, p.excerpt, p.cover_image_url, p.published_at,
+            p.updated_at, p.reading_time_minutes, p.content_text,
+            ts_rank_cd(p.search_vector, query.q) AS rank
+        FROM blog_posts p, query
+        WHERE p.status = 'published'
+            AND p.search_vector @@ query.q
+            AND (tag_slugs IS NULL OR EXISTS (
+                SELECT 1 FROM blog_post_tags pt JOIN blog_tags t ON t.id = pt.tag_id
+                WHERE pt.post_id = p.id AND t.slug = ANY (tag_slugs)
+            ))
+    ),
+    page AS (
+        SELECT * FROM matches m
+        WHERE after_rank IS NULL OR (m.rank, m.id) < (after_rank, after_id)
+        ORDER BY m.rank DESC, m.id DESC
+        LIMIT max_results
+    )
+    SELECT page.id, page.title, page.slug, page.excerpt, page.cover_image_url,
+        page.published_at, page.updated_at, page.reading_time_minutes, page.rank,
+        ts_headline(
+            'english',
+            replace(replace(replace(coalesce(page.content_text, ''), '&', '&amp;'), '<', '&lt;'), '>', '&gt;'),
+            query.q,
+            'StartSel=<mark>, StopSel=</mark>, MinWords=15, MaxWords=35, MaxFragments=2'
+        ),
+        (SELECT count(*) FROM matches)
+    FROM page, query
+    ORDER BY page.rank DESC, page.id DESC;
+$$;
+
+-- Tag counts across every post matching the search.
+CREATE OR REPLACE FUNCTION search_blog_tag_facets(
+    search_query TEXT,
+    tag_slugs TEXT[] DEFAULT NULL
+)
+RETURNS TABLE (slug TEXT, name TEXT, post_count BIGINT)
+LANGUAGE sql STABLE AS $$
+    SELECT t.slug, t.name, count(*)
+    FROM blog_posts p
+    JOIN blog_post_tags pt ON pt.post_id = p.id
+    JOIN blog_tags t ON t.id = pt.tag_id
+    WHERE p.status = 'published'
+        AND p.search_vector @@ websearch_to_tsquery('english', search_query)
+        AND (tag_slugs IS NULL OR EXISTS (
+            SELECT 1 FROM blog_post_tags fpt JOIN blog_tags ft ON ft.id = fpt.tag_id
+            WHERE fpt.post_id = p.id AND ft.slug = ANY (tag_slugs)
+        ))
+    GROUP BY t.slug, t.name
+    ORDER BY count(*) DESC, t.name;
+$$;
+
+-- ============================================
+-- Relation sync
+-- ============================================
+
+-- Set a post's tags to exactly `tag_ids`. Unchanged rows are left alone and
+-- both statements run in the caller's single transaction.
+CREATE OR REPLACE FUNCTION sync_post_tags(target_post_id UUID, tag_ids UUID[])
+RETURNS VOID
+LANGUAGE sql AS $$
+    DELETE FROM blog_post_tags
+    WHERE post_id = target_post_id AND tag_id <> ALL (tag_ids);
+
+    INSERT INTO blog_post_tags (post_id, tag_id)
+    SELECT DISTINCT target_post_id, t FROM unnest(tag_ids) t
+    ON CONFLICT DO NOTHING;
+$$;
+
+-- Create (target_post_id NULL) or update a post and optionally set its tags,
+-- returning the saved post with a flat `tags` list, all in one call and one
+-- transaction, so an unknown tag leaves no half-created post. On update,
+-- keys missing from `changes` keep their current values; new editable
+-- columns must be added to the INSERT and SET lists. A post moving to
+-- 'published' gets published_at (from `changes`, else now()); one that was
+-- already published keeps its date. `changes.derived_excerpt` (the excerpt
+-- derived from new content) replaces the excerpt while it is blank or still
+-- derived; an excerpt sent back unchanged stays derived.
+CREATE OR REPLACE FUNCTION save_blog_post(
+    target_post_id UUID,
+    changes JSONB DEFAULT '{}',
+    tag_ids UUID[] DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE plpgsql AS $$
+DECLARE
+    saved JSONB;
+BEGIN
+    IF target_post_id IS NULL THEN
+        INSERT INTO blog_posts (
+            title, slug, excerpt, excerpt_auto, content, content_html, cover_image_url,
+            cover_image_srcset, status, author_id, published_at, meta_title,
+            meta_description, word_count, reading_time_minutes, toc, content_text
+        )
+        SELECT r.title, r.slug,
+            CASE WHEN a.auto THEN changes->>'derived_excerpt' ELSE r.excerpt END, a.auto,
+            coalesce(r.content, '{}'), r.content_html,
+            r.cover_image_url, r.cover_image_srcset, coalesce(r.status, 'draft'), r.author_id,
+            CASE WHEN r.status = 'published' THEN coalesce(r.published_at, now()) END,
+            r.meta_title, r.meta_description, coalesce(r.word_count, 0),
+            coalesce(r.reading_time_minutes, 0), coalesce(r.toc, '[]'), r.content_text
+        FROM jsonb_populate_record(NULL::blog_posts, changes) r,
+            LATERAL (SELECT btrim(coalesce(r.excerpt, '')) = '' AS auto) a
+        RETURNING id INTO target_post_id;
+    ELSIF changes <> '{}' THEN
+        UPDATE blog_posts p SET (
+            title, slug, excerpt, excerpt_auto, content, content_html, cover_image_url,
+            cover_image_srcset, status, published_at, meta_title, meta_description,
+            word_count, reading_time_minutes, toc, content_text
+        ) = (
+            SELECT r.title, r.slug,
+                CASE
+                    WHEN a.auto AND changes ? 'derived_excerpt' THEN changes->>'derived_excerpt'
+                    ELSE r.excerpt
+                END,
+                a.auto, r.content, r.content_html, r.cover_image_url,
+                r.cover_image_srcset, r.status,
+                CASE
+                    WHEN r.status <> 'published' THEN r.published_at
+                    WHEN p.status = 'published' AND p.published_at IS NOT NULL THEN p.published_at
+                    ELSE coalesce(r.published_at, now())
+                END,
+                r.meta_title, r.meta_description, r.word_count,
+                r.reading_time_minutes, r.toc, r.content_text
+            FROM jsonb_populate_record(p, changes) r,
+                LATERAL (SELECT CASE
+                    WHEN NOT changes ? 'excerpt' THEN p.excerpt_auto
+                    ELSE btrim(coalesce(r.excerpt, '')) = ''
+                        OR (p.excerpt_auto AND r.excerpt IS NOT DISTINCT FROM p.excerpt)
+                END AS auto) a
+        )
+        WHERE p.id = target_post_id;
+    END IF;
+
+    IF tag_ids IS NOT NULL AND EXISTS (SELECT 1 FROM blog_posts p WHERE p.id = target_post_id) THEN
+        PERFORM sync_post_tags(target_post_id, tag_ids);
+    END IF;
+
+    SELECT to_jsonb(p) - 'search_vector' - 'content_text' || jsonb_build_object(
+        'tags', coalesce((
+            SELECT jsonb_agg(jsonb_build_object('id', t.id, 'name', t.name, 'slug', t.slug) ORDER BY t.name)
+            FROM blog_post_tags pt JOIN blog_tags t ON t.id = pt.tag_id
+            WHERE pt.post_id = p.id
+        ), '[]')
+    )
+    INTO saved
+    FROM blog_posts p
+    WHERE p.id = target_post_id;
+
+    IF saved IS NULL THEN
+        RAISE EXCEPTION 'post not found' USING ERRCODE = 'P0002';
+    END IF;
+    RETURN saved;
+END;
+$$;
+
+-- Set an experience's featured posts to `posts` ([{post_id, sort_order}]),
+-- writing only removals, additions and changed sort orders. Returns the
+-- resulting list in order.
+CREATE OR REPLACE FUNCTION sync_featured_posts(target_experience_id UUID, posts JSONB)
+RETURNS SETOF work_featured_posts
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM work_featured_posts f
+    WHERE f.experience_id = target_experience_id
+        AND f.post_id NOT IN (
+            SELECT (p->>'post_id')::UUID FROM jsonb_array_elements(posts) p
+        );
+
+    INSERT INTO work_featured_posts (experience_id, post_id, sort_order)
+    SELECT target_experience_id, (p->>'post_id')::UUID, coalesce((p->>'sort_order')::INT, 0)
+    FROM jsonb_array_elements(posts) p
+    ON CONFLICT (experience_id, post_id) DO UPDATE SET sort_order = EXCLUDED.sort_order
+    WHERE work_featured_posts.sort_order IS DISTINCT FROM EXCLUDED.sort_order;
+
+    RETURN QUERY
+    SELECT * FROM work_featured_posts f
+    WHERE f.experience_id = target_experience_id
+    ORDER BY f.sort_order;
+END;
+$$;
+
+-- ============================================
+-- Experience detail
+-- ============================================
+
+-- An active experience with its timeline (newest first) and its published
+-- featured posts (in featured order) as one JSON document, or NULL. The post
+-- keys match POST_LIST_COLUMNS in backend/routes/blog.py plus sort_order.
+CREATE OR REPLACE FUNCTION get_experience_detail(target_slug TEXT)
+RETURNS JSONB
+LANGUAGE sql STABLE AS $$
+    SELECT to_jsonb(e) || jsonb_build_object(
+        'timeline', coalesce((
+            SELECT jsonb_agg(to_jsonb(t) ORDER BY t.event_date DESC)
+            FROM work_timeline_events t
+            WHERE t.experience_id = e.id
+        ), '[]'),
+        'featured_posts', coalesce((
+            SELECT jsonb_agg(jsonb_build_object(
+                'id', p.id,
+                'title', p.title,
+                'slug', p.slug,
+                'excerpt', p.excerpt,
+                'cover_image_url', p.cover_image_url,
+                'cover_image_srcset', p.cover_image_srcset,
+                'status', p.status,
+                'author_id', p.author_id,
+                'published_at', p.published_at,
+                'created_at', p.created_at,
+                'updated_at', p.updated_at,
+                'meta_title', p.meta_title,
+                'meta_description', p.meta_description,
+                'word_count', p.word_count,
+                'reading_time_minutes', p.reading_time_minutes,
+                'sort_order', f.sort_order
+            ) ORDER BY f.sort_order)
+            FROM work_featured_posts f
+            JOIN blog_posts p ON p.id = f.post_id
+            WHERE f.experience_id = e.id AND p.status = 'published'
+        ), '[]')
+    )
+    FROM work_experiences e
+    WHERE e.slug = target_slug AND e.is_active
+$$;
+
+-- ============================================
+-- Portfolio ordering
+-- ============================================
+
+-- sort_order values are spaced 1024 apart, so moving one item can usually
+-- take the midpoint between its new neighbours and rewrite a single row.
+
+-- Apply a complete gallery order in one statement. Only rows whose position
+-- changed are written (and returned).
+CREATE OR REPLACE FUNCTION reorder_portfolio_items(item_ids UUID[])
+RETURNS SETOF portfolio_items
+LANGUAGE plpgsql AS $$
+BEGIN
+    LOCK TABLE portfolio_items IN SHARE ROW EXCLUSIVE MODE;
+    IF (SELECT count(*) FROM portfolio_items) <> cardinality(item_ids)
+        OR (SELECT count(DISTINCT u) FROM unnest(item_ids) u) <> cardinality(item_ids)
+        OR EXISTS (
+            SELECT 1 FROM unnest(item_ids) u
+            WHERE NOT EXISTS (SELECT 1 FROM portfolio_items p WHERE p.id = u)
+        )
+    THEN
+        RAISE EXCEPTION 'item_ids must list every portfolio item once' USING ERRCODE = '22023';
+    END IF;
+
+    RETURN QUERY
+    UPDATE portfolio_items p SET sort_order = o.position * 1024
+    FROM unnest(item_ids) WITH ORDINALITY AS o(id, position)
+    WHERE p.id = o.id AND p.sort_order IS DISTINCT FROM o.position * 1024
+    RETURNING p.*;
+END;
+$$;
+
+-- Move one item between `after_id` and `before_id` (its new neighbours in
+-- display order). Given only one, the other is the row actually next to it,
+-- or none at the start or end. When the neighbours have no gap left, the
+-- gallery is respaced first.
+CREATE OR REPLACE FUNCTION move_portfolio_item(
+    item_id UUID,
+    after_id UUID DEFAULT NULL,
+    before_id UUID DEFAULT NULL
+)
+RETURNS SETOF portfolio_items
+LANGUAGE plpgsql AS $$
+DECLARE
+    lower_rank INT;
+    upper_rank INT;
+BEGIN
+    LOCK TABLE portfolio_items IN SHARE ROW EXCLUSIVE MODE;
+    IF NOT EXISTS (SELECT 1 FROM portfolio_items p WHERE p.id = item_id)
+        OR (after_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM portfolio_items p WHERE p.id = after_id))
+        OR (before_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM portfolio_items p WHERE p.id = before_id))
+    THEN
+        RAISE EXCEPTION 'portfolio item not found' USING ERRCODE = 'P0002';
+    END IF;
+    IF item_id IN (after_id, before_id) THEN
+        RAISE EXCEPTION 'an item cannot be its own neighbour' USING ERRCODE = '22023';
+    END IF;
+
+    IF before_id IS NULL THEN
+        SELECT o.next_id INTO before_id FROM (
+            SELECT q.id, lead(q.id) OVER (ORDER BY q.sort_order, q.created_at DESC) AS next_id
+            FROM portfolio_items q WHERE q.id <> item_id
+        ) o WHERE o.id = after_id;
+    ELSIF after_id IS NULL THEN
+        SELECT o.prev_id INTO after_id FROM (
+            SELECT q.id, lag(q.id) OVER (ORDER BY q.sort_order, q.created_at DESC) AS prev_id
+            FROM portfolio_items q WHERE q.id <> item_id
+        ) o WHERE o.id = before_id;
+    END IF;
+
+    SELECT p.sort_order INTO lower_rank FROM portfolio_items p WHERE p.id = after_id;
+    SELECT p.sort_order INTO upper_rank FROM portfolio_items p WHERE p.id = before_id;
+
+    IF lower_rank IS NOT NULL AND upper_rank IS NOT NULL AND upper_rank - lower_rank < 2 THEN
+        UPDATE portfolio_items p SET sort_order = o.position * 1024
+        FROM (
+            SELECT q.id, row_number() OVER (ORDER BY q.sort_order, q.created_at DESC) AS position
+            FROM portfolio_items q
+        ) o
+        WHERE p.id = o.id AND p.sort_order IS DISTINCT FROM o.position * 1024;
+
+        SELECT p.sort_order INTO lower_rank FROM portfolio_items p WHERE p.id = after_id;
+        SELECT p.sort_order INTO upper_rank FROM portfolio_items p WHERE p.id = before_id;
+        IF upper_rank <= lower_rank THEN
+            RAISE EXCEPTION 'after_id must come before before_id' USING ERRCODE = '22023';
+        END IF;
+    END IF;
+
+    RETURN QUERY
+    UPDATE portfolio_items p SET sort_order = CASE
+        WHEN lower_rank IS NULL THEN upper_rank - 1024
+        WHEN upper_rank IS NULL THEN lower_rank + 1024
+        ELSE (lower_rank + upper_rank) / 2
+    END
+    WHERE p.id = item_id
+    RETURNING p.*;
+END;
+$$;
+
+-- ============================================
+-- Realtime change feed
+-- ============================================
+
+-- The API subscribes to these tables to drop cached responses when rows are
+-- edited outside it (backend/change_feed.py). DELETE events carry only the
+-- primary key unless REPLICA IDENTITY FULL is set. The API sets it on the
+-- small child tables so their deletes carry the parent id, which is how it
+-- recognises the echo of rows a sync or cascade removed (MATCH_COLUMNS).
+ALTER PUBLICATION supabase_realtime ADD TABLE
+    blog_posts, blog_post_tags, blog_tags, portfolio_items, work_experiences,
+    work_timeline_events, work_featured_posts, influences, site_settings;
+
+ALTER TABLE work_timeline_events REPLICA IDENTITY FULL;
+ALTER TABLE work_featured_posts REPLICA IDENTITY FULL;
+
 -- ============================================
 -- Row Level Security
 -- ============================================